@@ -0,0 +1,33 @@
+"""
+Base Cog condivisa
+
+FlexCog calcola una sola volta, alla definizione della classe, i metadati
+usati dal sistema di help (nome visualizzato e descrizione breve).
+"""
+
+from discord.ext import commands
+from typing import Optional, Tuple
+
+
+def describe_cog(cog_name: str, doc: Optional[str]) -> Tuple[str, str]:
+    """Ritorna (display_name, short_description) per un cog"""
+    # Nome pulito (senza suffisso "Cog")
+    display_name = cog_name.replace("Cog", "")
+    
+    # Descrizione troncata a 100 caratteri
+    description = doc or "No description"
+    if len(description) > 100:
+        description = description[:97] + "..."
+    
+    return display_name, description
+
+
+class FlexCog(commands.Cog):
+    """Cog base dei plugin FlexCore con metadati di help precalcolati"""
+    
+    display_name: str
+    short_description: str
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.display_name, cls.short_description = describe_cog(cls.__name__, cls.__doc__)
@@ -0,0 +1,224 @@
+"""
+Config Loader condiviso
+
+Gestisce il ciclo di vita della configurazione JSON di un plugin (config/<nome>.json):
+1. Auto-Create: crea il file con i default se non esiste
+2. Load: carica il JSON (orjson se disponibile)
+3. Validate & Repair: chiavi mancanti, sotto-dizionari e controlli del plugin
+   (saltato se il file è identico all'ultimo già validato con lo stesso schema)
+4. Save: riscrive il file (in modo atomico) solo se il contenuto è cambiato
+
+Uso:
+    loader = ConfigLoader("example", DEFAULTS, validator=my_checks)
+    config = await loader.load_async()
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+# orjson (estensione C) se disponibile, altrimenti json della stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# msgspec (validazione dello schema in C) se disponibile
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class ConfigLoader:
+    """Carica, valida e salva la configurazione di un plugin"""
+
+    def __init__(self, name: str, defaults: Dict,
+                 validator: Optional[Callable[[Dict], bool]] = None,
+                 schema: Optional[type] = None,
+                 schema_version: int = 1):
+        """
+        Args:
+            name: Nome del file in config/ (senza estensione)
+            defaults: Configurazione di default
+            validator: Controlli specifici del plugin, ripara in place e
+                       ritorna False se ha modificato qualcosa
+            schema: msgspec.Struct con tutti i campi obbligatori (e
+                    forbid_unknown_fields=True); se il file lo rispetta la
+                    validazione Python, validator compreso, viene saltata:
+                    ogni controllo del validator deve essere coperto dallo schema
+            schema_version: Da incrementare quando cambiano i controlli del
+                            validator, così i file già validati vengono ricontrollati
+        """
+        self.name = name
+        self.defaults = defaults
+        self.validator = validator
+        self.schema = schema
+        self.path = os.path.join("config", f"{name}.json")
+        # Impronta dell'ultimo file validato, legata ai default e alla versione dei controlli
+        self.fingerprint_path = os.path.join("config", f".{name}.fingerprint")
+        self._schema_key = hashlib.blake2b(self.dump(defaults), digest_size=16,
+                                           person=str(schema_version).encode()[:16]).digest()
+
+        self.config = defaults
+        self._mtime = None  # mtime del file all'ultimo caricamento
+
+    async def load_async(self) -> Dict:
+        """Come load(), ma in un thread per non bloccare l'event loop"""
+        return await asyncio.to_thread(self.load)
+
+    def load(self) -> Dict:
+        """Carica e valida la configurazione, riparandola se necessario"""
+        # 0. File invariato dall'ultimo caricamento: config già in memoria
+        try:
+            if os.stat(self.path).st_mtime_ns == self._mtime:
+                return self.config
+        except OSError:
+            pass
+
+        logger.debug("🔌 [%s] Verifica configurazione...", self.name)
+
+        # 1. Auto-Create
+        if not os.path.exists(self.path):
+            logger.info("⚙️ [%s] Creazione config in %s...", self.name, self.path)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self.save(self.defaults)
+                return self._loaded(self.defaults)
+            except Exception as e:
+                logger.error("❌ [%s] Errore creazione config: %s", self.name, e)
+                return self.defaults
+
+        # 2. Load
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+
+            # File già validato con questi default: niente Validate & Repair
+            if self._read_fingerprint() == self._fingerprint(raw):
+                config = orjson.loads(raw) if orjson else json.loads(raw)
+                logger.debug("✅ [%s] Configurazione invariata, validazione saltata.", self.name)
+                return self._loaded(config)
+
+            # Fast path: file completo e tipizzato, parse + validazione in un solo passaggio
+            config = self._decode_valid(raw)
+            if config is not None:
+                logger.info("✅ [%s] Configurazione caricata e validata.", self.name)
+                self._write_fingerprint(raw)
+                return self._loaded(config)
+
+            config = orjson.loads(raw) if orjson else json.loads(raw)
+        except Exception as e:
+            logger.error("❌ [%s] Errore caricamento config (JSON corrotto): %s", self.name, e)
+            return self.defaults
+
+        # 3. Validate & Repair
+        valid = True
+
+        for key, default_val in self.defaults.items():
+            # Chiavi mancanti
+            if key not in config:
+                logger.warning("⚠️ [%s] Chiave '%s' mancante, aggiunta default.", self.name, key)
+                config[key] = copy.deepcopy(default_val)
+                valid = False
+
+            # Deep check dei sotto-dizionari
+            elif isinstance(default_val, dict):
+                if not isinstance(config[key], dict):
+                    logger.warning("⚠️ [%s] '%s' invalido, ripristinato default.", self.name, key)
+                    config[key] = copy.deepcopy(default_val)
+                    valid = False
+                    continue
+                for sub_key, sub_val in default_val.items():
+                    if sub_key not in config[key]:
+                        config[key][sub_key] = sub_val
+                        valid = False
+
+        # Controlli specifici del plugin
+        if self.validator and not self.validator(config):
+            valid = False
+
+        # Save if repaired
+        if not valid:
+            logger.warning("🔧 [%s] Configurazione riparata e salvata.", self.name)
+            self.save(config)
+        else:
+            logger.info("✅ [%s] Configurazione caricata e validata.", self.name)
+            self._write_fingerprint(raw)
+
+        return self._loaded(config)
+
+    def save(self, config: Dict):
+        """Salva la configurazione su file (salta la scrittura se identica)"""
+        data = self.dump(config)
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read() == data:
+                    self._write_fingerprint(data)
+                    return
+        except FileNotFoundError:
+            pass
+
+        # Scrittura atomica: un crash a metà non lascia un JSON troncato
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._write_fingerprint(data)
+
+    @staticmethod
+    def dump(config: Dict) -> bytes:
+        """Serializza la configurazione in JSON (UTF-8, indentato di 2 spazi)"""
+        # Stesso formato con e senza orjson: il file non cambia a seconda delle dipendenze
+        if orjson:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        return json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _fingerprint(self, raw: bytes) -> str:
+        """Hash del contenuto del file, con default e schema_version come chiave"""
+        return hashlib.blake2b(raw, digest_size=16, key=self._schema_key).hexdigest()
+
+    def _read_fingerprint(self) -> Optional[str]:
+        """Impronta salvata dell'ultimo file validato, None se assente"""
+        try:
+            with open(self.fingerprint_path, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write_fingerprint(self, raw: bytes):
+        """Registra il contenuto appena validato/salvato"""
+        # Scrittura atomica come in save(): mai un'impronta troncata
+        tmp_path = self.fingerprint_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self._fingerprint(raw))
+            os.replace(tmp_path, self.fingerprint_path)
+        except OSError as e:
+            logger.debug("[%s] Impossibile salvare l'impronta: %s", self.name, e)
+
+    def _decode_valid(self, raw: bytes) -> Optional[Dict]:
+        """Decodifica con msgspec se il file rispetta lo schema, None altrimenti (il validator non viene chiamato)"""
+        if not (msgspec and self.schema):
+            return None
+        try:
+            return msgspec.to_builtins(msgspec.json.decode(raw, type=self.schema))
+        except msgspec.DecodeError:
+            # JSON corrotto o schema non rispettato: validazione e riparazione classica
+            return None
+
+    def _loaded(self, config: Dict) -> Dict:
+        """Memorizza config e mtime del file per saltare i reload inutili"""
+        self.config = config
+        try:
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._mtime = None
+        return config
@@ -0,0 +1,7 @@
+from .create import create_ticket
+from .views import TicketControlsView
+from .close import close_ticket
+from .delete import delete_ticket
+from .claim import claim_ticket
+from .move import move_ticket
+from .members import add_ticket_members, set_many_permissions
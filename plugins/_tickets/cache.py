@@ -0,0 +1,44 @@
+import discord
+from typing import Optional, Dict, Tuple
+
+class GuildObjectCache:
+    """
+    Memoized guild.get_role / guild.get_channel lookups, keyed by (guild_id, object_id).
+    Entries are dropped by the cog's role/channel update and delete listeners.
+    """
+    def __init__(self):
+        self._roles: Dict[Tuple[int, int], discord.Role] = {}
+        self._categories: Dict[Tuple[int, int], discord.CategoryChannel] = {}
+
+    def get_role(self, guild: discord.Guild, role_id: int) -> Optional[discord.Role]:
+        key = (guild.id, role_id)
+        role = self._roles.get(key)
+        if role is None:
+            role = guild.get_role(role_id)
+            if role is not None:
+                self._roles[key] = role
+        return role
+
+    def get_category(self, guild: discord.Guild, category_id: int) -> Optional[discord.CategoryChannel]:
+        key = (guild.id, category_id)
+        category = self._categories.get(key)
+        if category is None:
+            category = guild.get_channel(category_id)
+            if not isinstance(category, discord.CategoryChannel):
+                return None
+            self._categories[key] = category
+        return category
+
+    def forget_role(self, guild_id: int, role_id: int):
+        self._roles.pop((guild_id, role_id), None)
+
+    def forget_category(self, guild_id: int, category_id: int):
+        self._categories.pop((guild_id, category_id), None)
+
+    def forget_guild(self, guild_id: int):
+        self._roles = {k: v for k, v in self._roles.items() if k[0] != guild_id}
+        self._categories = {k: v for k, v in self._categories.items() if k[0] != guild_id}
+
+    def clear(self):
+        self._roles.clear()
+        self._categories.clear()
@@ -1,5 +1,5 @@
 import discord
-from .views import TicketControlsView
+from .views import controls_view
 
 async def claim_ticket(interaction: discord.Interaction, bot, db, config):
     """
@@ -9,7 +9,7 @@ async def claim_ticket(interaction: discord.Interaction, bot, db, config):
     user = interaction.user
     
     # Check if this is a ticket channel
-    ticket = db.get_ticket_by_channel(channel.id)
+    ticket = await db.get_ticket_by_channel_async(channel.id)
     if not ticket:
         await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
         return
@@ -21,16 +21,15 @@ async def claim_ticket(interaction: discord.Interaction, bot, db, config):
         return
 
     # Update DB
-    db.claim_ticket(channel.id, user.id)
+    await db.claim_ticket_async(channel.id, user.id)
     
-    embed_color_hex = config.get("embed_colors", {}).get("claimed", "#0000FF")
-    embed_color = int(embed_color_hex.replace("#", ""), 16)
+    embed_color = config["_colors"]["claimed"]
     
     embed = discord.Embed(description=f"✅ Ticket claimed by {user.mention}", color=embed_color)
     await channel.send(embed=embed)
     
     # Update the view to disable the claim button
-    view = TicketControlsView(claimed=True)
+    view = controls_view(True)
     await interaction.message.edit(view=view)
     
     await interaction.response.send_message("✅ Ticket claimed.", ephemeral=True)
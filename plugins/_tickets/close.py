@@ -10,7 +10,7 @@ async def close_ticket(interaction: discord.Interaction, bot, db, config, confir
     guild = interaction.guild
     
     # Check if this is a ticket channel
-    ticket = db.get_ticket_by_channel(channel.id)
+    ticket = await db.get_ticket_by_channel_async(channel.id)
     if not ticket:
         await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
         return
@@ -26,7 +26,7 @@ async def close_ticket(interaction: discord.Interaction, bot, db, config, confir
         return
 
     # Update DB
-    db.close_ticket(channel.id)
+    await db.close_ticket_async(channel.id)
     
     # Update permissions (Lock channel)
     user_id = ticket['user_id']
@@ -41,8 +41,7 @@ async def close_ticket(interaction: discord.Interaction, bot, db, config, confir
     except:
         pass # Ignore if rename fails
         
-    embed_color_hex = config.get("embed_colors", {}).get("closed", "#FF0000")
-    embed_color = int(embed_color_hex.replace("#", ""), 16)
+    embed_color = config["_colors"]["closed"]
     
     description = f"Closed by {interaction.user.mention}"
     if reason:
@@ -1,8 +1,9 @@
 import discord
 import asyncio
-from .views import TicketControlsView
+from .cache import GuildObjectCache
+from .views import controls_view
 
-async def create_ticket(interaction: discord.Interaction, bot, db, config, category_name: str = None):
+async def create_ticket(interaction: discord.Interaction, bot, db, config, cache: GuildObjectCache, category_name: str = None):
     """
     Creates a new ticket channel.
     """
@@ -11,12 +12,7 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
     
     # Find category config
     categories = config.get("categories", [])
-    cat_config = None
-    if category_name:
-        for cat in categories:
-            if cat["name"] == category_name:
-                cat_config = cat
-                break
+    cat_config = config["_categories"].get(category_name) if category_name else None
     
     if not cat_config and categories:
         cat_config = categories[0] # Fallback
@@ -25,7 +21,7 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
         return
 
     # Check ticket limit
-    open_tickets = db.get_open_tickets_count(user.id, guild.id)
+    open_tickets = await db.get_open_tickets_count_async(user.id, guild.id)
     limit = cat_config.get("max_tickets", 1)
     
     if open_tickets >= limit:
@@ -34,7 +30,7 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
 
     # Get category channel
     category_id = cat_config.get("category_id")
-    category = guild.get_channel(category_id) if category_id else None
+    category = cache.get_category(guild, category_id) if category_id else None
     
     if not category:
         # Try to find a category named "Tickets" or create it
@@ -51,7 +47,7 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
     ticket_num = db.get_next_ticket_number(guild.id, prefix)
     
     # Create channel
-    channel_name = f"{prefix}-{ticket_num:04d}"
+    channel_name = cat_config["_channel_template"] % ticket_num
     
     overwrites = {
         guild.default_role: discord.PermissionOverwrite(read_messages=False),
@@ -62,7 +58,7 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
     # Add support role
     support_role_id = config.get("support_role_id")
     if support_role_id:
-        support_role = guild.get_role(support_role_id)
+        support_role = cache.get_role(guild, support_role_id)
         if support_role:
             overwrites[support_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
     
@@ -73,21 +69,20 @@ async def create_ticket(interaction: discord.Interaction, bot, db, config, categ
         return
 
     # Add to DB
-    db.create_ticket(channel.id, user.id, guild.id, prefix, ticket_num)
+    await db.create_ticket_async(channel.id, user.id, guild.id, prefix, ticket_num)
     
     # Send welcome message
     welcome_msg = cat_config.get("welcome_message", "Support will be with you shortly.")
-    embed_color_hex = config.get("embed_colors", {}).get("open", "#00FF00")
-    embed_color = int(embed_color_hex.replace("#", ""), 16)
+    embed_color = config["_colors"]["open"]
     
     embed = discord.Embed(
-        title=f"{cat_config.get('emoji', '')} {cat_config.get('name', 'Ticket')} #{ticket_num:04d}", 
+        title=cat_config["_title_template"] % ticket_num, 
         description=welcome_msg, 
         color=embed_color
     )
     
     # Create View for controls
-    view = TicketControlsView(claimed=False)
+    view = controls_view(False)
     
     await channel.send(content=f"{user.mention}", embed=embed, view=view)
     
@@ -0,0 +1,65 @@
+import discord
+import asyncio
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+async def _delete_channel_and_row(channel: discord.TextChannel, db):
+    try:
+        await channel.delete()
+    except discord.NotFound:
+        pass # Already gone
+    except discord.HTTPException as e:
+        # The channel is still there, so the ticket stays open and usable
+        logger.warning("Could not delete ticket channel %s: %s", channel.id, e)
+        return
+    await db.delete_ticket_async(channel.id)
+
+async def _delayed_delete(channel: discord.TextChannel, db, delay: float):
+    # Only the countdown can be cancelled: once the channel delete starts, the DB
+    # write must follow even if the cog unloads meanwhile
+    await asyncio.sleep(delay)
+    work = asyncio.ensure_future(_delete_channel_and_row(channel, db))
+    try:
+        await asyncio.shield(work)
+    except asyncio.CancelledError:
+        await asyncio.wait((work,))
+        raise
+
+async def delete_ticket(interaction: discord.Interaction, bot, db, config, pending: Dict[int, asyncio.Task],
+                        confirmed: bool = False, reason: str = None):
+    """
+    Deletes the ticket channel.
+    """
+    channel = interaction.channel
+    
+    # Check if this is a ticket channel
+    ticket = await db.get_ticket_by_channel_async(channel.id)
+    if not ticket:
+        await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
+        return
+
+    if not confirmed:
+        return
+
+    embed_color = config["_colors"]["deleted"]
+    
+    description = "Deleting ticket in 5 seconds..."
+    if reason:
+        description = f"**Reason:** {reason}\n\n" + description
+        
+    embed = discord.Embed(description=description, color=embed_color)
+    
+    if not interaction.response.is_done():
+        await interaction.response.send_message(embed=embed, ephemeral=False)
+    else:
+        await interaction.followup.send(embed=embed)
+
+    # Countdown runs in its own task so the interaction handler returns right away.
+    # `pending` is owned by the cog, which cancels/awaits these tasks on unload.
+    if channel.id not in pending:
+        task = asyncio.create_task(_delayed_delete(channel, db, 5))
+        pending[channel.id] = task
+        task.add_done_callback(lambda _: pending.pop(channel.id, None))
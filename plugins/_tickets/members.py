@@ -0,0 +1,39 @@
+import discord
+from typing import Dict, List, Optional
+
+async def set_many_permissions(channel: discord.abc.GuildChannel, targets: Dict[discord.abc.Snowflake, Optional[discord.PermissionOverwrite]], reason: str = None):
+    """
+    Applies several permission overwrites with a single channel edit.
+    A value of None removes the overwrite for that target.
+    """
+    overwrites = dict(channel.overwrites)
+    for target, overwrite in targets.items():
+        if overwrite is None:
+            overwrites.pop(target, None)
+        else:
+            overwrites[target] = overwrite
+    await channel.edit(overwrites=overwrites, reason=reason)
+
+async def add_ticket_members(interaction: discord.Interaction, bot, db, config, users: List[discord.Member]):
+    """
+    Adds several users to the ticket in one API call.
+    """
+    channel = interaction.channel
+
+    ticket = await db.get_ticket_by_channel_async(channel.id)
+    if not ticket:
+        await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
+        return
+
+    # Drop duplicates while keeping the order they were given in
+    users = list(dict.fromkeys(users))
+    overwrite = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+
+    try:
+        await set_many_permissions(channel, {user: overwrite for user in users}, reason="batch add")
+    except discord.Forbidden:
+        await interaction.response.send_message("❌ I don't have permission to edit the channel.", ephemeral=True)
+        return
+
+    mentions = ", ".join(user.mention for user in users)
+    await interaction.response.send_message(f"✅ Added {mentions} to the ticket.")
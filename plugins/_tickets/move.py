@@ -1,6 +1,7 @@
 import discord
+from .cache import GuildObjectCache
 
-async def move_ticket(interaction: discord.Interaction, bot, db, config, category_id: int):
+async def move_ticket(interaction: discord.Interaction, bot, db, config, cache: GuildObjectCache, category_id: int):
     """
     Moves the ticket to another category.
     """
@@ -8,13 +9,13 @@ async def move_ticket(interaction: discord.Interaction, bot, db, config, categor
     guild = interaction.guild
     
     # Check if this is a ticket channel
-    ticket = db.get_ticket_by_channel(channel.id)
+    ticket = await db.get_ticket_by_channel_async(channel.id)
     if not ticket:
         await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
         return
 
-    category = guild.get_channel(category_id)
-    if not category or not isinstance(category, discord.CategoryChannel):
+    category = cache.get_category(guild, category_id)
+    if not category:
         await interaction.response.send_message("❌ Invalid category.", ephemeral=True)
         return
         
@@ -1,27 +1,32 @@
 import discord
 from discord.ui import View, Select, Button, Modal, TextInput
+from functools import lru_cache
 from typing import Optional, List, Dict
 
+def build_category_options(categories: List[Dict]) -> List[discord.SelectOption]:
+    """Select options for the ticket panel, built once per config load"""
+    return [
+        discord.SelectOption(
+            label=cat.get("name", "Unknown"),
+            description=cat.get("description", ""),
+            value=cat.get("name"), # Use name as ID for simplicity
+            emoji=cat.get("emoji")
+        )
+        for cat in categories
+    ]
+
 class TicketPanelView(View):
-    def __init__(self, categories: List[Dict]):
+    def __init__(self, options: List[discord.SelectOption]):
         super().__init__(timeout=None)
-        self.add_item(TicketCategorySelect(categories))
+        self.add_item(TicketCategorySelect(options))
 
 class TicketCategorySelect(Select):
-    def __init__(self, categories: List[Dict]):
-        options = []
-        for cat in categories:
-            options.append(discord.SelectOption(
-                label=cat.get("name", "Unknown"),
-                description=cat.get("description", ""),
-                value=cat.get("name"), # Use name as ID for simplicity
-                emoji=cat.get("emoji")
-            ))
-        
+    def __init__(self, options: List[discord.SelectOption]):
         super().__init__(
             placeholder="Select a category to open a ticket...",
             min_values=1,
             max_values=1,
+            options=list(options),
             custom_id="ticket_category_select"
         )
 
@@ -91,6 +96,16 @@ class ConfirmationView(View):
             emoji="📝"
         ))
 
+# The control views are stateless (timeout=None, dispatched by custom_id), so one
+# instance per variant is shared. Built on first use: View() needs a running loop.
+@lru_cache(maxsize=None)
+def controls_view(claimed: bool = False) -> TicketControlsView:
+    return TicketControlsView(claimed=claimed)
+
+@lru_cache(maxsize=None)
+def confirmation_view(action: str) -> ConfirmationView:
+    return ConfirmationView(action=action)
+
 class ReasonModal(Modal):
     def __init__(self, action: str, callback_func):
         super().__init__(title=f"Reason for {action}")
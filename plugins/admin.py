@@ -12,15 +12,207 @@ Owner-only commands for development and maintenance.
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional
-import traceback
+from typing import Optional, List, Tuple
+import logging
 
-class AdminCog(commands.Cog):
+from ._base import FlexCog, describe_cog
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Discord embed limits
+MAX_FIELD_VALUE = 1024
+MAX_FIELDS_PER_EMBED = 25
+HELP_PAGE_CHARS = 5000  # Below the 6000-char embed limit, leaves room for title/footer
+
+# Static embed parts, copied per command instead of rebuilt from scratch
+_STATS_TEMPLATE = discord.Embed(title="📊 Bot Statistics", color=discord.Color.blue())
+
+
+class HelpPaginator(discord.ui.View):
+    """Previous/next buttons to browse the help pages"""
+    
+    def __init__(self, pages: List[discord.Embed], author_id: int):
+        super().__init__(timeout=120)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self._update_buttons()
+    
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index == len(self.pages) - 1
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the user who requested the help can change page!", ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(label="Previous", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.index -= 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+    
+    @discord.ui.button(label="Next", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.index += 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+
+class AdminCog(FlexCog):
     """Administrative utilities for bot owners"""
     
     def __init__(self, bot):
         self.bot = bot
-        print("✅ [Admin] Utilities loaded!")
+        
+        # Help pages are cached and rebuilt only when the loaded cogs change
+        self._help_cache = None
+        self._help_slash_cache = None
+        self._cogs_snapshot = ()
+        
+        # Command counters, recomputed only when the loaded cogs change
+        self._text_cmd_count = 0
+        self._slash_cmd_count = 0
+        
+        # Precomputed help fields: {cog_name: [(field_name, field_value), ...]}
+        self._cog_field_cache = {}
+        self._slash_field_cache = {}
+        
+        # Slash command lookup: {command_name: app_commands.Command}
+        self._slash_index = {}
+        
+        # Bot-wide member total, computed on first use and kept up to date by listeners
+        self._member_total = None
+        
+        logger.info("✅ Utilities loaded!")
+    
+    # ==================== HELP CACHE ====================
+    
+    def _invalidate_help_cache(self):
+        """Drop the cached help pages so the next call rebuilds them"""
+        self._help_cache = None
+        self._help_slash_cache = None
+    
+    def _refresh_if_cogs_changed(self):
+        """Invalidate cached help data if a cog was added, removed or reloaded
+        
+        discord.py does not dispatch an event when cogs change, so we compare
+        the currently loaded cog instances with the ones seen on the last build.
+        """
+        snapshot = tuple(self.bot.cogs.values())
+        if snapshot != self._cogs_snapshot:
+            self._cogs_snapshot = snapshot
+            self._recount()
+            self._invalidate_help_cache()
+    
+    def _recount(self):
+        """Recompute counters, help fields and the slash index in a single pass"""
+        self._text_cmd_count = len(list(self.bot.walk_commands()))
+        self._slash_cmd_count = 0
+        self._cog_field_cache = {}
+        self._slash_field_cache = {}
+        self._slash_index = {}
+        
+        for cog_name, cog in self.bot.cogs.items():
+            slash_commands = getattr(cog, '__cog_app_commands__', ())
+            self._slash_cmd_count += len(slash_commands)
+            for cmd in slash_commands:
+                # First cog wins, as with the previous linear scan
+                self._slash_index.setdefault(cmd.name, cmd)
+            
+            fields = self._build_cog_fields(cog_name, cog)
+            if fields:
+                self._cog_field_cache[cog_name] = fields
+            
+            if slash_commands:
+                display_name, _ = self._describe(cog_name, cog)
+                self._slash_field_cache[cog_name] = self._split_field(
+                    f"🔌 {display_name}", "", [f"`/{cmd.name}`" for cmd in slash_commands]
+                )
+    
+    def _build_cog_fields(self, cog_name: str, cog: commands.Cog) -> List[Tuple[str, str]]:
+        """Build the (name, value) help fields for a cog, empty if it has no commands"""
+        # Get text commands from this cog
+        text_commands = [cmd for cmd in cog.get_commands() if not cmd.hidden]
+        
+        # Get slash commands from this cog
+        slash_commands = getattr(cog, '__cog_app_commands__', [])
+        
+        # Build command list
+        cmd_list = [f"`!{cmd.name}`" for cmd in text_commands]
+        text_names = {cmd.name for cmd in text_commands}
+        
+        for cmd in slash_commands:
+            if cmd.name not in text_names:  # Avoid duplicates
+                cmd_list.append(f"`/{cmd.name}`")
+        
+        if not cmd_list:
+            return []
+        
+        display_name, description = self._describe(cog_name, cog)
+        return self._split_field(f"🔌 {display_name}", f"*{description}*\n", cmd_list)
+    
+    def _describe(self, cog_name: str, cog: commands.Cog) -> Tuple[str, str]:
+        """Display name and short description, precomputed for FlexCog subclasses"""
+        if isinstance(cog, FlexCog):
+            return cog.display_name, cog.short_description
+        return describe_cog(cog_name, cog.__doc__)
+    
+    def _split_field(self, name: str, header: str, items: List[str]) -> List[Tuple[str, str]]:
+        """Join items with ' • ', splitting into several fields to respect the value limit"""
+        values = []
+        current = []
+        length = len(header)
+        
+        for item in items:
+            extra = len(item) + (3 if current else 0)
+            if current and length + extra > MAX_FIELD_VALUE:
+                values.append(header + " • ".join(current))
+                header, current, length = "", [], 0
+                extra = len(item)
+            current.append(item)
+            length += extra
+        
+        values.append(header + " • ".join(current))
+        return [(name if i == 0 else f"{name} (cont.)", value) for i, value in enumerate(values)]
+    
+    def _paginate(self, title: str, description: str, fields: List[Tuple[str, str]], footer: str) -> List[discord.Embed]:
+        """Distribute help fields over as many embeds as needed"""
+        template = discord.Embed(title=title, description=description, color=discord.Color.blue())
+        pages = []
+        embed = None
+        size = 0
+        
+        for name, value in fields:
+            field_size = len(name) + len(value)
+            if embed is None or len(embed.fields) >= MAX_FIELDS_PER_EMBED or size + field_size > HELP_PAGE_CHARS:
+                embed = template.copy()
+                pages.append(embed)
+                size = len(title) + len(description)
+            embed.add_field(name=name, value=value, inline=False)
+            size += field_size
+        
+        if not pages:
+            pages.append(template)
+        
+        for number, page in enumerate(pages, start=1):
+            page_footer = footer if len(pages) == 1 else f"Page {number}/{len(pages)} | {footer}"
+            page.set_footer(text=page_footer)
+        
+        return pages
+    
+    # ==================== ERROR HANDLING ====================
+    
+    async def cog_command_error(self, ctx, error):
+        """Single error handler for all text commands of this cog"""
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("❌ Only the bot owner can reload plugins!")
+        else:
+            # Defining this handler silences discord.py's default one, so keep the traceback
+            logger.error("Error in command '%s'", ctx.command, exc_info=error)
     
     # ==================== RELOAD SYSTEM ====================
     
@@ -33,11 +225,9 @@ class AdminCog(commands.Cog):
         Example: !reload moderation
         """
         try:
-            # Unload
-            await self.bot.unload_extension(f"plugins.{plugin}")
-            
-            # Reload
-            await self.bot.load_extension(f"plugins.{plugin}")
+            # Reload (rolls back to the previous version if loading fails)
+            await self.bot.reload_extension(f"plugins.{plugin}")
+            self._invalidate_help_cache()
             
             embed = discord.Embed(
                 title="🔄 Plugin Reloaded",
@@ -45,7 +235,7 @@ class AdminCog(commands.Cog):
                 color=discord.Color.green()
             )
             await ctx.send(embed=embed)
-            print(f"[Admin] Plugin '{plugin}' reloaded by {ctx.author}")
+            logger.info("Plugin '%s' reloaded by %s", plugin, ctx.author)
             
         except commands.ExtensionNotLoaded:
             await ctx.send(f"❌ Plugin **{plugin}** is not loaded!")
@@ -58,8 +248,7 @@ class AdminCog(commands.Cog):
                 color=discord.Color.red()
             )
             await ctx.send(embed=error_embed)
-            print(f"[Admin] Error reloading '{plugin}': {e}")
-            traceback.print_exc()
+            logger.exception("Error reloading '%s'", plugin)
     
     @app_commands.command(name="reload", description="Hot reload a plugin (Owner Only)")
     @app_commands.describe(plugin="Name of the plugin to reload")
@@ -70,35 +259,33 @@ class AdminCog(commands.Cog):
             await interaction.response.send_message("❌ Only the bot owner can use this command!", ephemeral=True)
             return
         
+        # Acknowledge first: importing the plugin can take longer than the 3s window
+        await interaction.response.defer(ephemeral=True)
+        
         try:
-            # Unload & Reload
-            await self.bot.unload_extension(f"plugins.{plugin}")
-            await self.bot.load_extension(f"plugins.{plugin}")
+            # Reload (rolls back to the previous version if loading fails)
+            await self.bot.reload_extension(f"plugins.{plugin}")
+            self._invalidate_help_cache()
             
             embed = discord.Embed(
                 title="🔄 Plugin Reloaded",
                 description=f"✅ **{plugin}** has been reloaded successfully!",
                 color=discord.Color.green()
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            print(f"[Admin] Plugin '{plugin}' reloaded by {interaction.user}")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            logger.info("Plugin '%s' reloaded by %s", plugin, interaction.user)
             
         except commands.ExtensionNotLoaded:
-            await interaction.response.send_message(f"❌ Plugin **{plugin}** is not loaded!", ephemeral=True)
+            await interaction.followup.send(f"❌ Plugin **{plugin}** is not loaded!", ephemeral=True)
         except commands.ExtensionNotFound:
-            await interaction.response.send_message(f"❌ Plugin **{plugin}** not found!", ephemeral=True)
+            await interaction.followup.send(f"❌ Plugin **{plugin}** not found!", ephemeral=True)
         except Exception as e:
             error_embed = discord.Embed(
                 title="❌ Reload Failed",
                 description=f"**Plugin:** {plugin}\n\n**Error:**\n```py\n{str(e)[:500]}\n```",
                 color=discord.Color.red()
             )
-            await interaction.response.send_message(embed=error_embed, ephemeral=True)
-    
-    @reload_command.error
-    async def reload_error(self, ctx, error):
-        if isinstance(error, commands.NotOwner):
-            await ctx.send("❌ Only the bot owner can reload plugins!")
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
     
     # ==================== DYNAMIC HELP SYSTEM ====================
     
@@ -126,97 +313,50 @@ class AdminCog(commands.Cog):
     
     async def _show_all_commands(self, ctx):
         """Show all commands grouped by plugin"""
-        embed = discord.Embed(
-            title="📚 Bot Commands",
-            description=f"Prefix: `{self.bot.command_prefix}` | Use `!help <command>` for details",
-            color=discord.Color.blue(),
-            timestamp=discord.utils.utcnow()
-        )
-        
-        # Group commands by cog
-        for cog_name, cog in sorted(self.bot.cogs.items()):
-            # Get text commands from this cog
-            text_commands = [cmd for cmd in cog.get_commands() if not cmd.hidden]
-            
-            # Get slash commands from this cog
-            slash_commands = []
-            if hasattr(cog, '__cog_app_commands__'):
-                slash_commands = cog.__cog_app_commands__
-            
-            if text_commands or slash_commands:
-                # Build command list
-                cmd_list = []
-                
-                # Add text commands
-                for cmd in text_commands[:5]:  # Limit to 5 per plugin
-                    cmd_list.append(f"`!{cmd.name}`")
-                
-                # Add slash commands
-                for cmd in slash_commands[:5]:
-                    if cmd.name not in [c.name for c in text_commands]:  # Avoid duplicates
-                        cmd_list.append(f"`/{cmd.name}`")
-                
-                if cmd_list:
-                    # Clean cog name (remove "Cog" suffix)
-                    display_name = cog_name.replace("Cog", "")
-                    
-                    # Get cog description
-                    description = cog.__doc__ or "No description"
-                    if len(description) > 100:
-                        description = description[:97] + "..."
-                    
-                    field_value = f"*{description}*\n" + " • ".join(cmd_list)
-                    
-                    if len(cmd_list) > 5:
-                        field_value += f"\n*+{len(cmd_list) - 5} more*"
-                    
-                    embed.add_field(
-                        name=f"🔌 {display_name}",
-                        value=field_value,
-                        inline=False
-                    )
-        
-        # Footer
-        total_commands = len(list(self.bot.walk_commands()))
-        embed.set_footer(text=f"Total Commands: {total_commands} | Use /help for slash commands")
+        self._refresh_if_cogs_changed()
+        if self._help_cache is None:
+            self._help_cache = self._build_help_pages()
         
-        await ctx.send(embed=embed)
+        pages = self._help_cache
+        kwargs = {"embed": pages[0]}
+        if len(pages) > 1:
+            kwargs["view"] = HelpPaginator(pages, ctx.author.id)
+        await ctx.send(**kwargs)
+    
+    def _build_help_pages(self) -> List[discord.Embed]:
+        """Build the text help pages from the precomputed cog fields"""
+        fields = [field for cog_name in sorted(self._cog_field_cache) for field in self._cog_field_cache[cog_name]]
+        return self._paginate(
+            "📚 Bot Commands",
+            f"Prefix: `{self.bot.command_prefix}` | Use `!help <command>` for details",
+            fields,
+            f"Total Commands: {self._text_cmd_count} | Use /help for slash commands"
+        )
     
     async def _show_all_commands_slash(self, interaction: discord.Interaction):
         """Show all slash commands grouped by plugin"""
-        embed = discord.Embed(
-            title="📚 Bot Slash Commands",
-            description="All available slash commands organized by plugin",
-            color=discord.Color.blue(),
-            timestamp=discord.utils.utcnow()
-        )
+        # Acknowledge first, then (re)build the pages if needed
+        await interaction.response.defer()
         
-        # Group commands by cog
-        for cog_name, cog in sorted(self.bot.cogs.items()):
-            # Get slash commands from this cog
-            if hasattr(cog, '__cog_app_commands__'):
-                slash_commands = cog.__cog_app_commands__
-                
-                if slash_commands:
-                    cmd_list = []
-                    for cmd in slash_commands[:8]:
-                        cmd_list.append(f"`/{cmd.name}`")
-                    
-                    # Clean cog name
-                    display_name = cog_name.replace("Cog", "")
-                    
-                    field_value = " • ".join(cmd_list)
-                    if len(slash_commands) > 8:
-                        field_value += f"\n*+{len(slash_commands) - 8} more*"
-                    
-                    embed.add_field(
-                        name=f"🔌 {display_name}",
-                        value=field_value,
-                        inline=False
-                    )
-        
-        embed.set_footer(text="Use /help <command> for detailed info")
-        await interaction.response.send_message(embed=embed)
+        self._refresh_if_cogs_changed()
+        if self._help_slash_cache is None:
+            self._help_slash_cache = self._build_help_slash_pages()
+        
+        pages = self._help_slash_cache
+        kwargs = {"embed": pages[0]}
+        if len(pages) > 1:
+            kwargs["view"] = HelpPaginator(pages, interaction.user.id)
+        await interaction.followup.send(**kwargs)
+    
+    def _build_help_slash_pages(self) -> List[discord.Embed]:
+        """Build the slash help pages from the precomputed cog fields"""
+        fields = [field for cog_name in sorted(self._slash_field_cache) for field in self._slash_field_cache[cog_name]]
+        return self._paginate(
+            "📚 Bot Slash Commands",
+            "All available slash commands organized by plugin",
+            fields,
+            "Use /help <command> for detailed info"
+        )
     
     async def _show_command_help(self, ctx, command_name: str):
         """Show detailed help for a specific command"""
@@ -257,15 +397,8 @@ class AdminCog(commands.Cog):
     async def _show_command_help_slash(self, interaction: discord.Interaction, command_name: str):
         """Show detailed help for a specific slash command"""
         # Find slash command
-        found_cmd = None
-        for cog in self.bot.cogs.values():
-            if hasattr(cog, '__cog_app_commands__'):
-                for cmd in cog.__cog_app_commands__:
-                    if cmd.name == command_name:
-                        found_cmd = cmd
-                        break
-            if found_cmd:
-                break
+        self._refresh_if_cogs_changed()
+        found_cmd = self._slash_index.get(command_name)
         
         if not found_cmd:
             await interaction.response.send_message(f"❌ Slash command `{command_name}` not found!", ephemeral=True)
@@ -294,23 +427,20 @@ class AdminCog(commands.Cog):
     @commands.command(name="botstats")
     async def botstats_command(self, ctx):
         """Show bot statistics and information"""
-        embed = discord.Embed(
-            title="📊 Bot Statistics",
-            color=discord.Color.blue(),
-            timestamp=discord.utils.utcnow()
-        )
+        embed = _STATS_TEMPLATE.copy()
+        embed.timestamp = discord.utils.utcnow()
         
         # Server & User count
-        total_users = sum(guild.member_count for guild in self.bot.guilds)
+        if self._member_total is None:
+            self._member_total = sum(guild.member_count or 0 for guild in self.bot.guilds)
         embed.add_field(name="📊 Servers", value=len(self.bot.guilds), inline=True)
-        embed.add_field(name="👥 Users", value=total_users, inline=True)
+        embed.add_field(name="👥 Users", value=self._member_total, inline=True)
         embed.add_field(name="🏓 Ping", value=f"{round(self.bot.latency * 1000)}ms", inline=True)
         
         # Commands count
-        text_cmds = len(list(self.bot.walk_commands()))
-        slash_cmds = len([cmd for cog in self.bot.cogs.values() if hasattr(cog, '__cog_app_commands__') for cmd in cog.__cog_app_commands__])
-        embed.add_field(name="📝 Text Commands", value=text_cmds, inline=True)
-        embed.add_field(name="⚡ Slash Commands", value=slash_cmds, inline=True)
+        self._refresh_if_cogs_changed()
+        embed.add_field(name="📝 Text Commands", value=self._text_cmd_count, inline=True)
+        embed.add_field(name="⚡ Slash Commands", value=self._slash_cmd_count, inline=True)
         embed.add_field(name="🔌 Plugins", value=len(self.bot.cogs), inline=True)
         
         if self.bot.user.avatar:
@@ -319,6 +449,29 @@ class AdminCog(commands.Cog):
         embed.set_footer(text=f"Bot: {self.bot.user.name}")
         await ctx.send(embed=embed)
 
+    
+    # ==================== MEMBER COUNT TRACKING ====================
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if self._member_total is not None:
+            self._member_total += 1
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        if self._member_total is not None:
+            self._member_total -= 1
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        if self._member_total is not None:
+            self._member_total += guild.member_count or 0
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        if self._member_total is not None:
+            self._member_total -= guild.member_count or 0
+
 
 async def setup(bot):
     await bot.add_cog(AdminCog(bot))
@@ -15,107 +15,173 @@ Vedi PLUGINS.md per la documentazione completa.
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
-import os
-from typing import Optional
+import re
+import logging
+from typing import Optional, List
 
-class ExampleCog(commands.Cog):
+from ._base import FlexCog
+from ._config import ConfigLoader
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# msgspec (validazione dello schema in C) se disponibile
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec:
+    # forbid_unknown_fields: un file con chiavi in più passa dalla riparazione classica
+    # invece di perderle in silenzio. Lo schema copre tutti i controlli di _validate_config
+    class AutoReactConfig(msgspec.Struct, forbid_unknown_fields=True):
+        """Schema di 'auto_react' (tutti i campi obbligatori)"""
+        enabled: bool
+        emoji: str
+
+    class ExampleConfig(msgspec.Struct, forbid_unknown_fields=True):
+        """Schema completo della config: se il file lo rispetta non serve riparare nulla"""
+        enabled: bool
+        welcome_message: str
+        welcome_channel_id: int
+        admin_role_id: int
+        respond_to_hello: bool
+        hello_triggers: List[str]
+        auto_react: AutoReactConfig
+
+# pyahocorasick (automa Aho-Corasick in C) se disponibile, altrimenti regex
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class TriggerMatcher:
+    """Cerca una qualsiasi parola chiave (parola intera) in una sola passata sul testo"""
+    
+    def __init__(self, keywords):
+        words = {kw.lower() for kw in keywords if kw}
+        self._automaton = None
+        self._regex = None
+        
+        if words and ahocorasick:
+            self._automaton = ahocorasick.Automaton()
+            for word in words:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+        elif words:
+            # Alternanza unica compilata: le parole più lunghe per prime
+            alternatives = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+            self._regex = re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE)
+    
+    def search(self, text: str) -> bool:
+        """True se il testo contiene almeno una delle parole chiave"""
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        if self._automaton is None:
+            return False
+        
+        lowered = text.lower()
+        for end, word in self._automaton.iter(lowered):
+            start = end - len(word) + 1
+            if start > 0 and _is_word_char(lowered[start - 1]):
+                continue
+            if end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+                continue
+            return True
+        return False
+
+# Parti statiche degli embed, copiate invece di ricostruite a ogni comando
+_KICK_TEMPLATE = discord.Embed(title="👢 Kick (SIMULATO)", color=discord.Color.orange())
+
+# Colori di /choose, creati una sola volta
+_CHOOSE_COLORS = {
+    "red": discord.Color.red(),
+    "green": discord.Color.green(),
+    "blue": discord.Color.blue(),
+    "yellow": discord.Color.gold()
+}
+_DEFAULT_COLOR = discord.Color.default()
+
+class ExampleCog(FlexCog):
     """Plugin di esempio con tutte le funzionalità"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.config_name = "example"
-        self.config_path = os.path.join("config", f"{self.config_name}.json")
         
         # Configurazione di default
         self.default_config = {
+            "enabled": True,
             "welcome_message": "Benvenuto {user} nel server! 👋",
             "welcome_channel_id": 0,  # 0 = disabilitato
             "admin_role_id": 0,
             "respond_to_hello": True,
+            "hello_triggers": ["ciao"],
             "auto_react": {
                 "enabled": False,
                 "emoji": "👍"
             }
         }
         
-        # Carica e valida la configurazione all'avvio
-        self.config = self._load_and_validate_config()
+        self.config_loader = ConfigLoader(
+            "example",
+            self.default_config,
+            validator=self._validate_config,
+            schema=ExampleConfig if msgspec else None
+        )
         
-        print(f"✅ [Example] Plugin caricato!")
+        # Default finché cog_load non carica la configurazione dal disco
+        self._apply_config(self.default_config)
+        
+        logger.info("✅ Plugin caricato!")
+    
+    async def cog_load(self):
+        """Carica e valida la configurazione all'avvio senza bloccare l'event loop"""
+        self._apply_config(await self._load_and_validate_config())
     
     # ==================== CONFIG SYSTEM ====================
     
-    def _load_and_validate_config(self):
-        """
-        Sistema di configurazione completo:
-        1. Auto-Create: Crea il file se non esiste
-        2. Load: Carica il JSON
-        3. Validate & Repair: Controlla e ripara errori
-        """
-        print(f"🔌 [Example] Verifica configurazione...")
-
-        # 1. Auto-Create Config
-        if not os.path.exists(self.config_path):
-            print(f"⚙️ [Example] Creazione config in {self.config_path}...")
-            try:
-                os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-                self._save_config(self.default_config)
-                return self.default_config
-            except Exception as e:
-                print(f"❌ [Example] Errore creazione config: {e}")
-                return self.default_config
-
-        # 2. Load Config
-        try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        except Exception as e:
-            print(f"❌ [Example] Errore caricamento config (JSON corrotto): {e}")
-            return self.default_config
-
-        # 3. Validate & Repair Config
+    def _apply_config(self, config):
+        """Imposta la config e precalcola i valori usati negli eventi"""
+        self.config = config
+        self._welcome_channel_id = config.get("welcome_channel_id")
+        self._welcome_message = config["welcome_message"]
+        self._respond_hello = bool(config.get("respond_to_hello"))
+        self._hello_matcher = TriggerMatcher(config.get("hello_triggers", []))
+        self._auto_react_enabled = bool(config["auto_react"].get("enabled"))
+        self._auto_react_emoji = config["auto_react"].get("emoji", "👍")
+        self._any_message_feature = self._respond_hello or self._auto_react_enabled
+    
+    async def _load_and_validate_config(self):
+        """Carica e valida la config in un thread (I/O su disco + JSON)"""
+        return await self.config_loader.load_async()
+    
+    def _validate_config(self, config) -> bool:
+        """Controlli di tipo specifici del plugin, ritorna False se ha riparato qualcosa"""
         valid = True
         
-        # Check top-level keys
-        for key, default_val in self.default_config.items():
-            if key not in config:
-                print(f"⚠️ [Example] Chiave '{key}' mancante, aggiunta default.")
-                config[key] = default_val
-                valid = False
-        
-        # Deep check: auto_react
-        if "auto_react" in config and isinstance(config["auto_react"], dict):
-            for key, val in self.default_config["auto_react"].items():
-                if key not in config["auto_react"]:
-                    config["auto_react"][key] = val
-                    valid = False
-        else:
-            config["auto_react"] = self.default_config["auto_react"]
+        triggers = config.get("hello_triggers")
+        if not isinstance(triggers, list) or not all(isinstance(t, str) for t in triggers):
+            config["hello_triggers"] = self.default_config["hello_triggers"]
             valid = False
         
-        # Type checks
         if not isinstance(config.get("enabled"), bool):
             config["enabled"] = True
             valid = False
+        
+        if not isinstance(config["auto_react"].get("enabled"), bool):
+            config["auto_react"]["enabled"] = self.default_config["auto_react"]["enabled"]
+            valid = False
             
         if not isinstance(config.get("welcome_message"), str):
             config["welcome_message"] = self.default_config["welcome_message"]
             valid = False
-
-        # Save if repaired
-        if not valid:
-            print(f"🔧 [Example] Configurazione riparata e salvata.")
-            self._save_config(config)
-        else:
-            print(f"✅ [Example] Configurazione caricata e validata.")
-
-        return config
-
-    def _save_config(self, config):
-        """Salva la configurazione su file"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        
+        return valid
     
     # ==================== TEXT COMMANDS ====================
     
@@ -162,12 +228,6 @@ class ExampleCog(commands.Cog):
         """Comando riservato agli admin (Text Command con Permessi)"""
         await ctx.send("✅ Sei un admin! Hai accesso a questo comando.")
     
-    @adminonly_command.error
-    async def adminonly_error(self, ctx, error):
-        """Error handler per il comando admin"""
-        if isinstance(error, commands.MissingPermissions):
-            await ctx.send("❌ Solo gli amministratori possono usare questo comando!")
-    
     # ==================== SLASH COMMANDS ====================
     
     @app_commands.command(name="hello", description="Saluta l'utente")
@@ -209,17 +269,10 @@ class ExampleCog(commands.Cog):
     ])
     async def choose_slash(self, interaction: discord.Interaction, option: app_commands.Choice[str]):
         """Slash Command con Choices (Dropdown)"""
-        colors = {
-            "red": discord.Color.red(),
-            "green": discord.Color.green(),
-            "blue": discord.Color.blue(),
-            "yellow": discord.Color.gold()
-        }
-        
         embed = discord.Embed(
             title=f"Hai scelto: {option.name}",
             description=f"Valore: `{option.value}`",
-            color=colors.get(option.value, discord.Color.default())
+            color=_CHOOSE_COLORS.get(option.value, _DEFAULT_COLOR)
         )
         
         await interaction.response.send_message(embed=embed)
@@ -241,11 +294,8 @@ class ExampleCog(commands.Cog):
     async def kick_slash(self, interaction: discord.Interaction, member: discord.Member, reason: Optional[str] = None):
         """Slash Command con Permessi (ESEMPIO - NON ESEGUE REALMENTE)"""
         # Questo è solo un esempio - non esegue realmente il kick
-        embed = discord.Embed(
-            title="👢 Kick (SIMULATO)",
-            description=f"Questo comando kickerebbe {member.mention}\n**Motivo:** {reason or 'Nessun motivo specificato'}",
-            color=discord.Color.orange()
-        )
+        embed = _KICK_TEMPLATE.copy()
+        embed.description = f"Questo comando kickerebbe {member.mention}\n**Motivo:** {reason or 'Nessun motivo specificato'}"
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     # ==================== EVENT LISTENERS ====================
@@ -257,37 +307,36 @@ class ExampleCog(commands.Cog):
             return
         
         # Invia messaggio di benvenuto se configurato
-        channel_id = self.config.get("welcome_channel_id")
+        channel_id = self._welcome_channel_id
         if channel_id and channel_id != 0:
             channel = member.guild.get_channel(channel_id)
             if channel:
-                message = self.config["welcome_message"].format(user=member.mention)
+                message = self._welcome_message.format(user=member.mention)
                 await channel.send(message)
-                print(f"[Example] Messaggio di benvenuto inviato per {member.name}")
+                logger.info("Messaggio di benvenuto inviato per %s", member.name)
     
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Evento: Messaggio inviato in qualsiasi canale"""
-        # Ignora i bot
-        if message.author.bot:
+        # Ignora i bot, o tutto se nessuna funzione sui messaggi è attiva
+        if message.author.bot or not self._any_message_feature:
             return
         
-        # Se configurato, risponde a "ciao"
-        if self.config.get("respond_to_hello") and "ciao" in message.content.lower():
+        # Se configurato, risponde alle parole chiave (default: "ciao")
+        if self._respond_hello and self._hello_matcher.search(message.content):
             await message.channel.send(f"Ciao {message.author.mention}! 👋")
         
         # Auto-react se abilitato
-        if self.config.get("auto_react", {}).get("enabled"):
-            emoji = self.config["auto_react"].get("emoji", "👍")
+        if self._auto_react_enabled:
             try:
-                await message.add_reaction(emoji)
+                await message.add_reaction(self._auto_react_emoji)
             except:
                 pass  # Ignora errori (es. emoji non valido)
     
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         """Evento: Membro lascia il server"""
-        print(f"[Example] {member.name} ha lasciato {member.guild.name}")
+        logger.info("%s ha lasciato %s", member.name, member.guild.name)
     
     # ==================== UTILITY COMMANDS ====================
     
@@ -295,13 +344,21 @@ class ExampleCog(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def reload_config_command(self, ctx):
         """Ricarica la configurazione del plugin (Solo Admin)"""
-        self.config = self._load_and_validate_config()
+        self._apply_config(await self._load_and_validate_config())
         await ctx.send("✅ Configurazione ricaricata!")
     
-    @reload_config_command.error
-    async def reload_config_error(self, ctx, error):
+    # ==================== ERROR HANDLING ====================
+    
+    async def cog_command_error(self, ctx, error):
+        """Error handler unico per tutti i text command del cog"""
         if isinstance(error, commands.MissingPermissions):
-            await ctx.send("❌ Solo gli admin possono ricaricare la configurazione!")
+            if ctx.command.name == "reload_config":
+                await ctx.send("❌ Solo gli admin possono ricaricare la configurazione!")
+            else:
+                await ctx.send("❌ Solo gli amministratori possono usare questo comando!")
+        else:
+            # Con questo handler discord.py non stampa più l'errore: lo facciamo noi
+            logger.error("❌ Errore nel comando '%s'", ctx.command, exc_info=error)
 
 
 async def setup(bot):
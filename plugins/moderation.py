@@ -18,342 +18,522 @@ Comandi disponibili:
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import json
 import os
 import asyncio
 import re
+import time
+import heapq
+import uuid
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Union, Any
-from collections import defaultdict
+from typing import Optional, Dict, List, Tuple, Union, Any
+from collections import defaultdict, deque
+from functools import partial, partialmethod, wraps
+from types import MappingProxyType
 
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 import sqlite3
 from utils.language_manager import get_text
 
+from ._config import ConfigLoader
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# ===== QUERY SQL =====
+# Costanti a livello di modulo: stesso testo a ogni chiamata, quindi la query
+# viene preparata una volta e poi riusata dalla cache della connessione
+
+_SQL_ADD_WARN = """
+    INSERT INTO warns (user_id, moderator_id, guild_id, reason)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_REMOVE_WARN = "DELETE FROM warns WHERE id = ?"
+_SQL_REMOVE_LAST_WARN = """
+    DELETE FROM warns WHERE id = (
+        SELECT id FROM warns 
+        WHERE user_id = ? AND guild_id = ?
+        ORDER BY timestamp DESC LIMIT 1
+    )
+"""
+_SQL_GET_WARN_COUNT = """
+    SELECT COUNT(*) as count FROM warns 
+    WHERE user_id = ? AND guild_id = ?
+"""
+
+_SQL_ADD_BAN = """
+    INSERT INTO bans (user_id, moderator_id, guild_id, reason, duration, expires_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_REMOVE_BAN = """
+    UPDATE bans SET active = 0 
+    WHERE user_id = ? AND guild_id = ? AND active = 1
+"""
+_SQL_GET_ACTIVE_BANS_GUILD = """
+    SELECT * FROM bans 
+    WHERE guild_id = ? AND active = 1
+    ORDER BY timestamp DESC
+"""
+_SQL_GET_ACTIVE_BANS = """
+    SELECT * FROM bans 
+    WHERE active = 1
+    ORDER BY timestamp DESC
+"""
+_SQL_EXPIRE_BANS = """
+    UPDATE bans SET active = 0 
+    WHERE id IN (
+        SELECT id FROM bans
+        WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
+        LIMIT ?
+    )
+    RETURNING id
+"""
+
+_SQL_ADD_MUTE = """
+    INSERT INTO mutes (user_id, moderator_id, guild_id, reason, duration, expires_at, native_timeout)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_REMOVE_MUTE = """
+    UPDATE mutes SET active = 0 
+    WHERE user_id = ? AND guild_id = ? AND active = 1
+"""
+_SQL_GET_ACTIVE_MUTES_GUILD = """
+    SELECT * FROM mutes 
+    WHERE guild_id = ? AND active = 1
+    ORDER BY timestamp DESC
+"""
+_SQL_GET_ACTIVE_MUTES = """
+    SELECT * FROM mutes 
+    WHERE active = 1
+    ORDER BY timestamp DESC
+"""
+_SQL_EXPIRE_MUTES = """
+    UPDATE mutes SET active = 0 
+    WHERE id IN (
+        SELECT id FROM mutes
+        WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
+        LIMIT ?
+    )
+    RETURNING id
+"""
+
+# Ban e mute temporanei ancora da far scadere (ripristino all'avvio);
+# i timeout nativi li fa scadere Discord
+_SQL_GET_ACTIVE_TEMP_ACTIONS = """
+    SELECT 'ban' AS kind, id, user_id, guild_id, expires_at FROM bans
+    WHERE active = 1 AND expires_at > ?
+    UNION ALL
+    SELECT 'mute' AS kind, id, user_id, guild_id, expires_at FROM mutes
+    WHERE active = 1 AND expires_at > ? AND native_timeout = 0
+"""
+
+_SQL_ADD_KICK = """
+    INSERT INTO kicks (user_id, moderator_id, guild_id, reason)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Storico per tabella: stessa forma per tutte, il nome tabella viene da questa whitelist
+_HISTORY_TABLES = ("warns", "bans", "mutes", "kicks")
+_SQL_GET_USER_ROWS = {
+    table: f"""
+    SELECT * FROM {table} 
+    WHERE user_id = ? AND guild_id = ?
+    ORDER BY timestamp DESC
+"""
+    for table in _HISTORY_TABLES
+}
+
+_SQL_GET_USER_HISTORY = """
+    SELECT 'warns' AS kind, id, user_id, moderator_id, guild_id, reason,
+           NULL AS duration, NULL AS expires_at, timestamp, NULL AS active
+    FROM warns WHERE user_id = ? AND guild_id = ?
+    UNION ALL
+    SELECT 'bans', id, user_id, moderator_id, guild_id, reason,
+           duration, expires_at, timestamp, active
+    FROM bans WHERE user_id = ? AND guild_id = ?
+    UNION ALL
+    SELECT 'mutes', id, user_id, moderator_id, guild_id, reason,
+           duration, expires_at, timestamp, active
+    FROM mutes WHERE user_id = ? AND guild_id = ?
+    UNION ALL
+    SELECT 'kicks', id, user_id, moderator_id, guild_id, reason,
+           NULL, NULL, timestamp, NULL
+    FROM kicks WHERE user_id = ? AND guild_id = ?
+    ORDER BY timestamp DESC
+"""
+
+_SQL_ADD_LOG = """
+    INSERT INTO mod_log (action_type, user_id, moderator_id, guild_id, details)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_LAST_ROWID = "SELECT last_insert_rowid()"
+
+_SQL_CLEAR_STALE_LOCK = "DELETE FROM moderation_locks WHERE name = ? AND expires_at <= ?"
+_SQL_ACQUIRE_LOCK = """
+    INSERT OR IGNORE INTO moderation_locks (name, holder, expires_at)
+    VALUES (?, ?, ?)
+"""
+_SQL_RELEASE_LOCK = "DELETE FROM moderation_locks WHERE name = ? AND holder = ?"
+
+# Default condiviso e immutabile per le sezioni mancanti del config (nessun {} per chiamata)
+_EMPTY = MappingProxyType({})
+
+# ===== EMBED =====
+# Colori di default per tipo di azione (embed_colors nel config li sovrascrive)
+_EMBED_COLORS: Dict[str, int] = {
+    "warn": 0xFFA500,
+    "unwarn": 0x90EE90,
+    "kick": 0xFF6347,
+    "ban": 0xDC143C,
+    "unban": 0x32CD32,
+    "mute": 0xFFD700,
+    "unmute": 0xADFF2F,
+    "success": 0x00FF00,
+    "error": 0xFF0000,
+    "info": 0x00BFFF,
+}
+_EMBED_COLOR_FALLBACK = 0x5865F2
+
+# ===== DURATE =====
+
+# Numero + unità (es. "30m", "7d")
+_DURATION_RE = re.compile(r'^(\d+)([smhdwMy])$')
+
+# Conversioni in secondi
+_UNIT_SECONDS = {
+    's': 1,              # secondi
+    'm': 60,             # minuti
+    'h': 3600,           # ore
+    'd': 86400,          # giorni
+    'w': 604800,         # settimane (7 giorni)
+    'M': 2592000,        # mesi (30 giorni)
+    'y': 31536000        # anni (365 giorni)
+}
+
+# Unità per _format_duration, dalla più grande alla più piccola
+_DURATION_LABELS = (
+    (31536000, "anno/i"),
+    (2592000, "mese/i"),
+    (604800, "settimana/e"),
+    (86400, "giorno/i"),
+    (3600, "ora/e"),
+    (60, "minuto/i"),
+)
+
+
 class ModerationDatabase:
     """Gestisce il database SQLite per il sistema di moderazione"""
     
     def __init__(self, db_path: str = "data/moderation.db"):
         self.db_path = db_path
         self._ensure_data_directory()
+        self._conn = self._connect()
         self._initialize_database()
+        # Identifica questo processo nei lock condivisi
+        self._lock_holder = uuid.uuid4().hex
     
     def _ensure_data_directory(self):
         """Crea la directory data se non esiste"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Ottiene una connessione al database"""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self) -> sqlite3.Connection:
+        """Apre la connessione persistente, riusata per tutta la vita del cog"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=512)
         conn.row_factory = sqlite3.Row  # Accesso per nome colonna
+        # WAL: le letture non vengono bloccate dalle scritture
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL fa fsync solo al checkpoint (resta consistente dopo un crash)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")     # ~20MB
+        conn.execute("PRAGMA mmap_size=268435456")   # 256MB
+        conn.execute("PRAGMA busy_timeout=5000")     # ms
         return conn
     
+    def close(self):
+        """Chiude la connessione al database"""
+        self._conn.close()
+    
     def _initialize_database(self):
         """Inizializza il database con le tabelle necessarie"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Tabella warns
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS warns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                guild_id INTEGER NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Tabella bans
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                guild_id INTEGER NOT NULL,
-                reason TEXT,
-                duration INTEGER,
-                expires_at DATETIME,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                active BOOLEAN DEFAULT 1
-            )
-        """)
-        
-        # Tabella mutes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS mutes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                guild_id INTEGER NOT NULL,
-                reason TEXT,
-                duration INTEGER,
-                expires_at DATETIME,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                active BOOLEAN DEFAULT 1
-            )
-        """)
-        
-        # Tabella kicks
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS kicks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                guild_id INTEGER NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Tabella mod_log (audit generale)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS mod_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                action_type TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                guild_id INTEGER NOT NULL,
-                details TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
+        with self._conn:
+            # Tabella warns
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS warns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    moderator_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    reason TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Tabella bans
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS bans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    moderator_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    reason TEXT,
+                    duration INTEGER,
+                    expires_at INTEGER,  -- unix timestamp
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    active BOOLEAN DEFAULT 1
+                )
+            """)
+            
+            # Tabella mutes
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mutes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    moderator_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    reason TEXT,
+                    duration INTEGER,
+                    expires_at INTEGER,  -- unix timestamp
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    active BOOLEAN DEFAULT 1,
+                    native_timeout BOOLEAN DEFAULT 0  -- timeout Discord invece del ruolo mute
+                )
+            """)
+            
+            # Tabella kicks
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS kicks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    moderator_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    reason TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Tabella mod_log (audit generale)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mod_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    action_type TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    moderator_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    details TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Indici per lo storico utente (user_id, guild_id)
+            for table in ("warns", "bans", "mutes", "kicks"):
+                self._conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_user_guild
+                    ON {table}(user_id, guild_id, timestamp DESC)
+                """)
+
+            # Lock tra processi (es. più shard sullo stesso database)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS moderation_locks (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at INTEGER NOT NULL
+                )
+            """)
+
+            # Migrazione: scadenze salvate come stringa ISO (ora locale) -> unix timestamp
+            for table in ("bans", "mutes"):
+                self._conn.execute(f"""
+                    UPDATE {table}
+                    SET expires_at = CAST(strftime('%s', expires_at, 'utc') AS INTEGER)
+                    WHERE typeof(expires_at) = 'text'
+                """)
+
+            # Migrazione: mutes senza la colonna native_timeout (tutti via ruolo)
+            mute_columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(mutes)")}
+            if "native_timeout" not in mute_columns:
+                self._conn.execute("ALTER TABLE mutes ADD COLUMN native_timeout BOOLEAN DEFAULT 0")
+
+            # Indici parziali per ban/mute attivi (cleanup e ripristino)
+            for table in ("bans", "mutes"):
+                self._conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_active_expiry
+                    ON {table}(active, expires_at) WHERE active = 1
+                """)
+
     # ===== WARNS =====
     
-    def add_warn(self, user_id: int, moderator_id: int, guild_id: int, reason: Optional[str] = None) -> int:
-        """Aggiunge un warn e ritorna l'ID"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO warns (user_id, moderator_id, guild_id, reason)
-            VALUES (?, ?, ?, ?)
-        """, (user_id, moderator_id, guild_id, reason))
-        
+    def _insert_warn(self, user_id: int, moderator_id: int, guild_id: int,
+                     reason: Optional[str]) -> Tuple[sqlite3.Cursor, int]:
+        """Inserisce il warn con la sua riga di audit (da chiamare dentro una transazione)"""
+        cursor = self._conn.execute(_SQL_ADD_WARN, (user_id, moderator_id, guild_id, reason))
         warn_id = cursor.lastrowid
         
         # Log nell'audit
         self._add_log(cursor, "WARN", user_id, moderator_id, guild_id, 
                      f"Warn #{warn_id}: {reason or 'Nessun motivo'}")
-        
-        conn.commit()
-        conn.close()
-        return warn_id
+        return cursor, warn_id
     
+    def add_warn(self, user_id: int, moderator_id: int, guild_id: int, reason: Optional[str] = None) -> int:
+        """Aggiunge un warn e ritorna l'ID"""
+        with self._conn:
+            _, warn_id = self._insert_warn(user_id, moderator_id, guild_id, reason)
+        return warn_id
+
+    def add_warn_and_count(self, user_id: int, moderator_id: int, guild_id: int,
+                           reason: Optional[str] = None) -> Tuple[int, int]:
+        """Aggiunge un warn e ritorna (ID, warn totali) in un'unica transazione"""
+        with self._conn:
+            cursor, warn_id = self._insert_warn(user_id, moderator_id, guild_id, reason)
+            
+            # Conteggio sulla stessa transazione (include il warn appena inserito)
+            warn_count = cursor.execute(_SQL_GET_WARN_COUNT, (user_id, guild_id)).fetchone()['count']
+        
+        return warn_id, warn_count
+
+    def add_warns(self, rows: List[tuple]) -> List[int]:
+        """
+        Aggiunge più warn in blocco (es. raid) e ritorna gli ID
+
+        Args:
+            rows: Lista di tuple (user_id, moderator_id, guild_id, reason)
+        """
+        if not rows:
+            return []
+
+        # Due executemany (warns + mod_log) in un'unica transazione
+        with self._conn:
+            self._conn.executemany(_SQL_ADD_WARN, rows)
+            # Il lock di scrittura è tenuto fino al commit: gli ID sono consecutivi
+            last_id = self._conn.execute(_SQL_LAST_ROWID).fetchone()[0]
+            warn_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+
+            self._conn.executemany(_SQL_ADD_LOG, [
+                ("WARN", user_id, moderator_id, guild_id,
+                 f"Warn #{warn_id}: {reason or 'Nessun motivo'}")
+                for warn_id, (user_id, moderator_id, guild_id, reason) in zip(warn_ids, rows)
+            ])
+
+        return warn_ids
+
     def remove_warn(self, warn_id: Optional[int] = None, user_id: Optional[int] = None, 
                     guild_id: Optional[int] = None) -> bool:
         """Rimuove un warn specifico o l'ultimo warn di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
         if warn_id:
-            cursor.execute("DELETE FROM warns WHERE id = ?", (warn_id,))
+            query, params = _SQL_REMOVE_WARN, (warn_id,)
         elif user_id and guild_id:
             # Rimuovi l'ultimo warn
-            cursor.execute("""
-                DELETE FROM warns WHERE id = (
-                    SELECT id FROM warns 
-                    WHERE user_id = ? AND guild_id = ?
-                    ORDER BY timestamp DESC LIMIT 1
-                )
-            """, (user_id, guild_id))
+            query, params = _SQL_REMOVE_LAST_WARN, (user_id, guild_id)
         else:
-            conn.close()
             return False
         
-        removed = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return removed
-    
-    def get_user_warns(self, user_id: int, guild_id: int) -> List[Dict]:
-        """Ottiene tutti i warn di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM warns 
-            WHERE user_id = ? AND guild_id = ?
-            ORDER BY timestamp DESC
-        """, (user_id, guild_id))
-        
-        warns = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return warns
+        with self._conn:
+            cursor = self._conn.execute(query, params)
+        return cursor.rowcount > 0
     
     def get_warn_count(self, user_id: int, guild_id: int) -> int:
         """Conta i warn di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor = self._conn.execute(_SQL_GET_WARN_COUNT, (user_id, guild_id))
         
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM warns 
-            WHERE user_id = ? AND guild_id = ?
-        """, (user_id, guild_id))
-        
-        count = cursor.fetchone()['count']
-        conn.close()
-        return count
+        return cursor.fetchone()['count']
     
     # ===== BANS =====
     
     def add_ban(self, user_id: int, moderator_id: int, guild_id: int, 
                 reason: Optional[str] = None, duration: Optional[int] = None) -> int:
         """Aggiunge un ban (duration in secondi, None = permanente)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        expires_at = None
-        if duration:
-            expires_at = datetime.now() + timedelta(seconds=duration)
-        
-        cursor.execute("""
-            INSERT INTO bans (user_id, moderator_id, guild_id, reason, duration, expires_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, moderator_id, guild_id, reason, duration, expires_at))
+        expires_at = int(time.time()) + duration if duration else None
         
-        ban_id = cursor.lastrowid
-        
-        # Log
-        ban_type = "temporaneo" if duration else "permanente"
-        self._add_log(cursor, "BAN", user_id, moderator_id, guild_id,
-                     f"Ban {ban_type}: {reason or 'Nessun motivo'}")
+        with self._conn:
+            cursor = self._conn.execute(_SQL_ADD_BAN, (user_id, moderator_id, guild_id, reason, duration, expires_at))
+            
+            ban_id = cursor.lastrowid
+            
+            # Log
+            ban_type = "temporaneo" if duration else "permanente"
+            self._add_log(cursor, "BAN", user_id, moderator_id, guild_id,
+                         f"Ban {ban_type}: {reason or 'Nessun motivo'}")
         
-        conn.commit()
-        conn.close()
         return ban_id
     
     def remove_ban(self, user_id: int, guild_id: int) -> bool:
         """Rimuove un ban (setta active = 0)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE bans SET active = 0 
-            WHERE user_id = ? AND guild_id = ? AND active = 1
-        """, (user_id, guild_id))
+        with self._conn:
+            cursor = self._conn.execute(_SQL_REMOVE_BAN, (user_id, guild_id))
         
-        removed = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return removed
+        return cursor.rowcount > 0
     
-    def get_active_bans(self, guild_id: Optional[int] = None) -> List[Dict]:
+    def get_active_bans(self, guild_id: Optional[int] = None) -> List[sqlite3.Row]:
         """Ottiene tutti i ban attivi (opzionalmente filtrati per guild)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
         if guild_id:
-            cursor.execute("""
-                SELECT * FROM bans 
-                WHERE guild_id = ? AND active = 1
-                ORDER BY timestamp DESC
-            """, (guild_id,))
+            cursor = self._conn.execute(_SQL_GET_ACTIVE_BANS_GUILD, (guild_id,))
         else:
-            cursor.execute("""
-                SELECT * FROM bans 
-                WHERE active = 1
-                ORDER BY timestamp DESC
-            """)
+            cursor = self._conn.execute(_SQL_GET_ACTIVE_BANS)
         
-        bans = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return bans
+        return cursor.fetchall()
     
     # ===== MUTES =====
     
     def add_mute(self, user_id: int, moderator_id: int, guild_id: int,
-                 reason: Optional[str] = None, duration: Optional[int] = None) -> int:
-        """Aggiunge un mute (duration in secondi, None = permanente)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        expires_at = None
-        if duration:
-            expires_at = datetime.now() + timedelta(seconds=duration)
-        
-        cursor.execute("""
-            INSERT INTO mutes (user_id, moderator_id, guild_id, reason, duration, expires_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, moderator_id, guild_id, reason, duration, expires_at))
+                 reason: Optional[str] = None, duration: Optional[int] = None,
+                 native_timeout: bool = False) -> int:
+        """Aggiunge un mute (duration in secondi, None = permanente; native_timeout = timeout Discord)"""
+        expires_at = int(time.time()) + duration if duration else None
         
-        mute_id = cursor.lastrowid
-        
-        # Log
-        mute_type = "temporaneo" if duration else "permanente"
-        self._add_log(cursor, "MUTE", user_id, moderator_id, guild_id,
-                     f"Mute {mute_type}: {reason or 'Nessun motivo'}")
+        with self._conn:
+            cursor = self._conn.execute(_SQL_ADD_MUTE, (user_id, moderator_id, guild_id, reason, duration,
+                                                        expires_at, int(native_timeout)))
+            
+            mute_id = cursor.lastrowid
+            
+            # Log
+            mute_type = "temporaneo" if duration else "permanente"
+            self._add_log(cursor, "MUTE", user_id, moderator_id, guild_id,
+                         f"Mute {mute_type}: {reason or 'Nessun motivo'}")
         
-        conn.commit()
-        conn.close()
         return mute_id
     
     def remove_mute(self, user_id: int, guild_id: int) -> bool:
         """Rimuove un mute (setta active = 0)"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE mutes SET active = 0 
-            WHERE user_id = ? AND guild_id = ? AND active = 1
-        """, (user_id, guild_id))
+        with self._conn:
+            cursor = self._conn.execute(_SQL_REMOVE_MUTE, (user_id, guild_id))
         
-        removed = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return removed
+        return cursor.rowcount > 0
     
-    def get_active_mutes(self, guild_id: Optional[int] = None) -> List[Dict]:
+    def get_active_mutes(self, guild_id: Optional[int] = None) -> List[sqlite3.Row]:
         """Ottiene tutti i mute attivi"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
         if guild_id:
-            cursor.execute("""
-                SELECT * FROM mutes 
-                WHERE guild_id = ? AND active = 1
-                ORDER BY timestamp DESC
-            """, (guild_id,))
+            cursor = self._conn.execute(_SQL_GET_ACTIVE_MUTES_GUILD, (guild_id,))
         else:
-            cursor.execute("""
-                SELECT * FROM mutes 
-                WHERE active = 1
-                ORDER BY timestamp DESC
-            """)
+            cursor = self._conn.execute(_SQL_GET_ACTIVE_MUTES)
+        
+        return cursor.fetchall()
+    
+    # ===== TEMPORANEI =====
+    
+    def get_active_temp_actions(self, now: float) -> List[sqlite3.Row]:
+        """Ban e mute attivi con scadenza futura, come righe (kind, id, user_id, guild_id, expires_at)"""
+        cursor = self._conn.execute(_SQL_GET_ACTIVE_TEMP_ACTIONS, (now, now))
         
-        mutes = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return mutes
+        return cursor.fetchall()
     
     # ===== KICKS =====
     
     def add_kick(self, user_id: int, moderator_id: int, guild_id: int, 
                  reason: Optional[str] = None) -> int:
         """Aggiunge un kick"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO kicks (user_id, moderator_id, guild_id, reason)
-            VALUES (?, ?, ?, ?)
-        """, (user_id, moderator_id, guild_id, reason))
-        
-        kick_id = cursor.lastrowid
-        
-        # Log
-        self._add_log(cursor, "KICK", user_id, moderator_id, guild_id,
-                     f"Kick: {reason or 'Nessun motivo'}")
+        with self._conn:
+            cursor = self._conn.execute(_SQL_ADD_KICK, (user_id, moderator_id, guild_id, reason))
+            
+            kick_id = cursor.lastrowid
+            
+            # Log
+            self._add_log(cursor, "KICK", user_id, moderator_id, guild_id,
+                         f"Kick: {reason or 'Nessun motivo'}")
         
-        conn.commit()
-        conn.close()
         return kick_id
     
     # ===== UTILITIES =====
@@ -361,129 +541,171 @@ class ModerationDatabase:
     def _add_log(self, cursor: sqlite3.Cursor, action_type: str, user_id: int, 
                  moderator_id: int, guild_id: int, details: str):
         """Aggiunge un entry nel log di moderazione"""
-        cursor.execute("""
-            INSERT INTO mod_log (action_type, user_id, moderator_id, guild_id, details)
-            VALUES (?, ?, ?, ?, ?)
-        """, (action_type, user_id, moderator_id, guild_id, details))
+        cursor.execute(_SQL_ADD_LOG, (action_type, user_id, moderator_id, guild_id, details))
     
-    def cleanup_expired(self) -> Dict[str, int]:
+    def cleanup_expired(self, batch: int = 500) -> Dict[str, int]:
         """Rimuove ban e mute scaduti, ritorna conteggi"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        now = datetime.now()
-        
-        # Conta ban scaduti
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM bans 
-            WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
-        """, (now,))
-        expired_bans = cursor.fetchone()['count']
-        
-        # Rimuovi ban scaduti
-        cursor.execute("""
-            UPDATE bans SET active = 0 
-            WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
-        """, (now,))
-        
-        # Conta mute scaduti
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM mutes 
-            WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
-        """, (now,))
-        expired_mutes = cursor.fetchone()['count']
-        
-        # Rimuovi mute scaduti
-        cursor.execute("""
-            UPDATE mutes SET active = 0 
-            WHERE active = 1 AND expires_at IS NOT NULL AND expires_at <= ?
-        """, (now,))
-        
-        conn.commit()
-        conn.close()
-        
-        return {"bans": expired_bans, "mutes": expired_mutes}
+        return {
+            "bans": self.cleanup_expired_bans(batch),
+            "mutes": self.cleanup_expired_mutes(batch)
+        }
+    
+    def cleanup_expired_bans(self, batch: int = 500) -> int:
+        """Disattiva i ban scaduti a blocchi, ritorna quanti"""
+        return self._expire_in_batches(_SQL_EXPIRE_BANS, batch)
+    
+    def cleanup_expired_mutes(self, batch: int = 500) -> int:
+        """Disattiva i mute scaduti a blocchi, ritorna quanti"""
+        return self._expire_in_batches(_SQL_EXPIRE_MUTES, batch)
+    
+    def _expire_in_batches(self, query: str, batch: int) -> int:
+        """
+        Esegue l'UPDATE ... RETURNING al massimo `batch` righe per transazione,
+        così il lock di scrittura resta breve anche con molte scadenze arretrate
+        """
+        now = int(time.time())
+        total = 0
+        
+        while True:
+            with self._conn:
+                expired = len(self._conn.execute(query, (now, batch)).fetchall())
+            total += expired
+            if expired < batch:
+                return total
+    
+    def acquire_lock(self, name: str, ttl: int) -> bool:
+        """
+        Prova a prendere un lock condiviso tra processi, ritorna False se è già tenuto.
+        Il lock scade dopo `ttl` secondi, così un processo terminato non lo blocca per sempre
+        """
+        now = int(time.time())
+        with self._conn:
+            self._conn.execute(_SQL_CLEAR_STALE_LOCK, (name, now))
+            cursor = self._conn.execute(_SQL_ACQUIRE_LOCK, (name, self._lock_holder, now + ttl))
+        return cursor.rowcount == 1
+    
+    def release_lock(self, name: str):
+        """Rilascia un lock preso con acquire_lock"""
+        with self._conn:
+            self._conn.execute(_SQL_RELEASE_LOCK, (name, self._lock_holder))
     
     def get_user_history(self, user_id: int, guild_id: int) -> Dict[str, Any]:
         """Ottiene tutto lo storico di moderazione di un utente"""
-        return {
-            "warns": self.get_user_warns(user_id, guild_id),
-            "bans": self._get_user_bans(user_id, guild_id),
-            "mutes": self._get_user_mutes(user_id, guild_id),
-            "kicks": self._get_user_kicks(user_id, guild_id)
-        }
+        # Una sola query (UNION ALL) al posto di quattro, poi smistamento per tabella.
+        # Le righe restano sqlite3.Row (accesso per nome colonna, nessuna copia in dict);
+        # per warn e kick duration/expires_at/active sono NULL
+        history = {"warns": [], "bans": [], "mutes": [], "kicks": []}
+        cursor = self._conn.execute(_SQL_GET_USER_HISTORY, (user_id, guild_id) * 4)
+        
+        for row in cursor.fetchall():
+            history[row["kind"]].append(row)
+        
+        return history
+    
+    def _get_user_rows(self, table: str, user_id: int, guild_id: int) -> List[sqlite3.Row]:
+        """Ottiene tutte le righe di un utente da una tabella dello storico"""
+        cursor = self._conn.execute(_SQL_GET_USER_ROWS[table], (user_id, guild_id))
+        return cursor.fetchall()
+    
+    get_user_warns = partialmethod(_get_user_rows, "warns")
+    _get_user_bans = partialmethod(_get_user_rows, "bans")
+    _get_user_mutes = partialmethod(_get_user_rows, "mutes")
+    _get_user_kicks = partialmethod(_get_user_rows, "kicks")
+
+def _moderator_check(level: str, action: str,
+                     denied: str = "❌ Non hai i permessi per usare questo comando!",
+                     rate_limit: bool = False, any_bot: bool = False, top_role: bool = True):
+    """
+    Controlli comuni dei comandi di moderazione su un membro, con risposta ephemeral se falliscono
     
-    def _get_user_bans(self, user_id: int, guild_id: int) -> List[Dict]:
-        """Ottiene tutti i ban di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM bans 
-            WHERE user_id = ? AND guild_id = ?
-            ORDER BY timestamp DESC
-        """, (user_id, guild_id))
-        
-        bans = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return bans
-    
-    def _get_user_mutes(self, user_id: int, guild_id: int) -> List[Dict]:
-        """Ottiene tutti i mute di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM mutes 
-            WHERE user_id = ? AND guild_id = ?
-            ORDER BY timestamp DESC
-        """, (user_id, guild_id))
-        
-        mutes = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return mutes
-    
-    def _get_user_kicks(self, user_id: int, guild_id: int) -> List[Dict]:
-        """Ottiene tutti i kick di un utente"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM kicks 
-            WHERE user_id = ? AND guild_id = ?
-            ORDER BY timestamp DESC
-        """, (user_id, guild_id))
-        
-        kicks = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return kicks
+    Args:
+        level: Livello richiesto per _check_permissions ("staff" o "admin")
+        action: Verbo usato nei messaggi (es. "kickare")
+        denied: Messaggio se mancano i permessi
+        rate_limit: Applica _check_rate_limit
+        any_bot: Blocca qualsiasi bot come bersaglio (altrimenti solo questo bot)
+        top_role: Blocca bersagli con ruolo superiore o uguale al moderatore
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, user: discord.Member, *args, **kwargs):
+            if not self._check_permissions(interaction.user, level):
+                error = denied
+            elif rate_limit and not self._check_rate_limit(interaction.user.id):
+                error = "⏱️ Stai usando troppi comandi di moderazione! Riprova tra qualche secondo."
+            elif user == interaction.user:
+                error = f"❌ Non puoi {action} te stesso!"
+            elif user.bot and (any_bot or user.id == self.bot.user.id):
+                error = f"❌ Non puoi {action} {'un bot' if any_bot else 'il bot'}!"
+            elif top_role and user.top_role >= interaction.user.top_role:
+                error = f"❌ Non puoi {action} qualcuno con un ruolo superiore o uguale al tuo!"
+            else:
+                return await func(self, interaction, user, *args, **kwargs)
+            
+            await interaction.response.send_message(error, ephemeral=True)
+        return wrapper
+    return decorator
 
 
 class ModerationCog(commands.Cog):
     """Plugin avanzato di moderazione con database e logging"""
     
+    # Richieste set_permissions in parallelo alla creazione del ruolo mute
+    MUTE_OVERWRITE_CONCURRENCY = 25
+    # Validità (secondi) dell'esito di _check_permissions in cache
+    PERMISSION_CACHE_TTL = 30
+    # Attesa massima (secondi) del DM prima di kick/ban, poi la sanzione procede
+    DM_TIMEOUT = 3
+    # Durata massima del timeout nativo di Discord: oltre (o permanente) si usa il ruolo mute
+    MAX_TIMEOUT_SECONDS = 28 * 24 * 3600
+    
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db = ModerationDatabase()
-        self.config = self._load_and_validate_config()
+        
+        # Ruolo mute risolto per guild: {guild_id: Role}
+        self._mute_role_cache: Dict[int, discord.Role] = {}
+        
+        # Esito dei controlli permessi: {(user_id, guild_id, livello): (timestamp, esito)}
+        self._perm_cache: Dict[Tuple[int, int, str], Tuple[float, bool]] = {}
+        
+        self.config_loader = ConfigLoader("moderation", self._default_config(),
+                                          validator=self._validate_config)
+        # Default finché cog_load non carica la configurazione dal disco
+        self._apply_config(self.config_loader.defaults)
         
         # Setup Logging
         self.logger = self._setup_logger()
         
-        # Rate limiting: {user_id: [timestamps]}
-        self.rate_limit_tracker = defaultdict(list)
+        # Rate limiting: {user_id: deque[timestamp monotonic]}, al massimo max_commands per utente
+        self.rate_limit_tracker = defaultdict(lambda: deque(maxlen=self._rl_max))
+        
+        # Le query girano in un thread; la connessione è una sola, quindi una alla volta
+        self._db_lock = asyncio.Lock()
+        self._cleanup_lock = asyncio.Lock()
         
         # Task manager per ban/mute temporanei
-        self.temp_actions = {}  # {action_id: task}
+        self.temp_actions = {}  # {action_id: task} (unban/unmute in corso)
+        
+        # Task in background (DM) con riferimento forte finché non terminano
+        self._bg_tasks = set()
+        
+        # Scadenze ban/mute temporanei: heap di (expires_at, kind, action_id, user_id, guild_id)
+        self._expiry_heap: List[tuple] = []
+        self._expiry_wakeup = asyncio.Event()
+        self._expiry_task: Optional[asyncio.Task] = None
         
         # Avvia task di pulizia periodica
         self.cleanup_task.start()
         self.restore_temp_actions.start()
+        self.rate_limit_cleanup.start()
 
     def _setup_logger(self):
         """Configura il logger su file"""
         logger = logging.getLogger('moderation')
         logger.setLevel(logging.INFO)
         
+        self._log_listener = None
         if not logger.handlers:
             # Crea directory logs se non esiste
             os.makedirs('logs', exist_ok=True)
@@ -500,15 +722,33 @@ class ModerationCog(commands.Cog):
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             handler.setFormatter(formatter)
-            logger.addHandler(handler)
+            
+            # Il logger accoda soltanto: scrittura e rotazione del file
+            # avvengono nel thread del listener, non sull'event loop
+            log_queue = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(log_queue))
+            self._log_listener = QueueListener(log_queue, handler)
+            self._log_listener.start()
             
         return logger
     
+    def _stop_logger(self):
+        """Scrive i log rimasti in coda e chiude il file"""
+        if not self._log_listener:
+            return
+        
+        self._log_listener.stop()
+        for handler in self._log_listener.handlers:
+            handler.close()
+        # Al prossimo caricamento del cog _setup_logger riparte da zero
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+    
     def _log_to_file(self, action: str, user: Union[discord.User, discord.Member], 
                      moderator: Union[discord.User, discord.Member], reason: str, 
                      details: str = ""):
-        """Scrive un log strutturato su file"""
-        if not self.config.get("log_file_enabled", True):
+        """Accoda un log strutturato per il file (la scrittura avviene nel thread del QueueListener)"""
+        if not self._log_file_enabled:
             return
             
         log_msg = f"ACTION={action} | USER={user} ({user.id}) | MOD={moderator} ({moderator.id}) | REASON={reason}"
@@ -517,77 +757,24 @@ class ModerationCog(commands.Cog):
             
         self.logger.info(log_msg)
     
-    def _load_and_validate_config(self) -> Dict:
+    async def cog_load(self):
+        """Carica e valida la configurazione all'avvio senza bloccare l'event loop"""
+        self._apply_config(await self._load_and_validate_config())
+        self._expiry_task = asyncio.create_task(self._expiry_scheduler())
+    
+    async def _load_and_validate_config(self) -> Dict:
         """
-        Gestisce il ciclo di vita della configurazione:
+        Gestisce il ciclo di vita della configurazione (vedi ConfigLoader):
         1. Auto-Create se non esiste
         2. Load
         3. Validate & Repair (Deep Check)
         """
-        config_path = os.path.join('config', 'moderation.json')
-        default_config = self._default_config()
-        
-        # 1. Auto-Create
-        if not os.path.exists(config_path):
-            print(f"⚙️ [Moderation] Creazione config default in {config_path}...")
-            try:
-                self._save_config(default_config, config_path)
-                return default_config
-            except Exception as e:
-                print(f"❌ [Moderation] Errore creazione config: {e}")
-                return default_config
-
-        # 2. Load
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        except Exception as e:
-            print(f"❌ [Moderation] Errore caricamento config (JSON corrotto): {e}")
-            print(f"⚠️ [Moderation] Uso configurazione di default (file non sovrascritto)")
-            return default_config
-
-        # 3. Validate & Repair
+        return await self.config_loader.load_async()
+    
+    def _validate_config(self, config: Dict) -> bool:
+        """Controlli di tipo specifici del plugin, ritorna False se ha riparato qualcosa"""
         valid = True
         
-        # Check Top-Level Keys
-        for key, default_val in default_config.items():
-            if key not in config:
-                print(f"⚠️ [Moderation] Chiave mancante '{key}', aggiunta default.")
-                config[key] = default_val
-                valid = False
-        
-        # Deep Check: embed_colors
-        if "embed_colors" in config and isinstance(config["embed_colors"], dict):
-            for key, val in default_config["embed_colors"].items():
-                if key not in config["embed_colors"]:
-                    print(f"⚠️ [Moderation] Colore mancante '{key}', aggiunto default.")
-                    config["embed_colors"][key] = val
-                    valid = False
-        else:
-            print(f"⚠️ [Moderation] 'embed_colors' invalido, ripristinato default.")
-            config["embed_colors"] = default_config["embed_colors"]
-            valid = False
-            
-        # Deep Check: rate_limit
-        if "rate_limit" in config and isinstance(config["rate_limit"], dict):
-            for key, val in default_config["rate_limit"].items():
-                if key not in config["rate_limit"]:
-                    config["rate_limit"][key] = val
-                    valid = False
-        else:
-            config["rate_limit"] = default_config["rate_limit"]
-            valid = False
-
-        # Deep Check: auto_actions
-        if "auto_actions" in config and isinstance(config["auto_actions"], dict):
-            for key, val in default_config["auto_actions"].items():
-                if key not in config["auto_actions"]:
-                    config["auto_actions"][key] = val
-                    valid = False
-        else:
-            config["auto_actions"] = default_config["auto_actions"]
-            valid = False
-            
         # Type Checks (Basic)
         if not isinstance(config.get("staff_roles"), list):
             config["staff_roles"] = []
@@ -597,19 +784,82 @@ class ModerationCog(commands.Cog):
             config["admin_roles"] = []
             valid = False
 
-        # Save if repaired
-        if not valid:
-            print(f"🔧 [Moderation] Configurazione riparata e salvata.")
-            self._save_config(config, config_path)
-        else:
-            print(f"✅ [Moderation] Configurazione caricata e validata.")
-
-        return config
+        # Valori numerici del rate limit (salvati come stringhe)
+        default_rate_limit = self.config_loader.defaults["rate_limit"]
+        for key in ("max_commands", "per_seconds"):
+            try:
+                int(config["rate_limit"][key])
+            except (ValueError, TypeError):
+                config["rate_limit"][key] = default_rate_limit[key]
+                valid = False
 
-    def _save_config(self, config: Dict, path: str):
-        """Helper per salvare la configurazione"""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
+        return valid
+    
+    def _apply_config(self, config: Dict):
+        """Memorizza la configurazione e pre-calcola i valori usati a ogni comando"""
+        self.config = config
+        
+        # Colori embed già convertiti da "#RRGGBB" a int (default per i tipi mancanti o invalidi)
+        self._colors = dict(_EMBED_COLORS)
+        for action_type, color_hex in (config.get("embed_colors") or _EMPTY).items():
+            try:
+                self._colors[action_type] = int(str(color_hex).replace("#", ""), 16)
+            except ValueError:
+                logger.warning("⚠️ [Moderation] Colore invalido per '%s': %s", action_type, color_hex)
+        
+        # Ruoli staff/admin come insiemi di ID (i placeholder non numerici vengono ignorati)
+        self._staff_role_ids = self._parse_ids(config.get("staff_roles", []))
+        self._admin_role_ids = self._parse_ids(config.get("admin_roles", []))
+        self._mod_role_ids = self._staff_role_ids | self._admin_role_ids
+        
+        # Canale log
+        try:
+            self._log_channel_id = int(config.get("log_channel_id"))
+        except (ValueError, TypeError):
+            self._log_channel_id = None
+        
+        # Ruolo mute configurato (il placeholder non numerico vale come non impostato)
+        try:
+            self._mute_role_id = int(config.get("mute_role_id") or 0) or None
+        except (ValueError, TypeError):
+            self._mute_role_id = None
+        
+        # Log strutturato su file e DM agli utenti sanzionati
+        self._log_file_enabled = bool(config.get("log_file_enabled", True))
+        self._dm_users = bool(config.get("dm_users", True))
+        
+        # Auto-actions sui warn e conteggio nell'embed
+        self._auto_actions_cfg = config.get("auto_actions") or _EMPTY
+        self._auto_enabled = bool(self._auto_actions_cfg.get("enabled", False))
+        try:
+            self._auto_ban_warns = int(self._auto_actions_cfg.get("auto_ban_warns", 5))
+            self._auto_mute_warns = int(self._auto_actions_cfg.get("auto_mute_warns", 3))
+        except (ValueError, TypeError):
+            logger.warning("⚠️ [Moderation] Soglie auto_actions invalide, disabilitate")
+            self._auto_enabled = False
+        self._show_warn_count = bool(config.get("show_warn_count", True))
+        
+        # Rate limiting
+        rate_limit = config["rate_limit"]
+        self._rl_enabled = rate_limit.get("enabled", False)
+        self._rl_max = int(rate_limit["max_commands"])
+        self._rl_window = int(rate_limit["per_seconds"])
+        
+        # Il ruolo mute e i ruoli staff/admin configurati potrebbero essere cambiati
+        self._mute_role_cache.clear()
+        self._perm_cache.clear()
+        self.rate_limit_cleanup.change_interval(seconds=max(self._rl_window, 1))
+    
+    @staticmethod
+    def _parse_ids(values: List) -> frozenset:
+        """Converte una lista di ID (int o stringhe) in un frozenset di int"""
+        ids = set()
+        for value in values:
+            try:
+                ids.add(int(value))
+            except (ValueError, TypeError):
+                pass
+        return frozenset(ids)
     
     def _default_config(self) -> Dict:
         """Configurazione di default"""
@@ -620,16 +870,7 @@ class ModerationCog(commands.Cog):
             "mute_role_id": "MUTED_ROLE_ID_HERE",
             "mute_role_name": "null",
             "embed_colors": {
-                "warn": "#FFA500",
-                "unwarn": "#90EE90",
-                "kick": "#FF6347",
-                "ban": "#DC143C",
-                "unban": "#32CD32",
-                "mute": "#FFD700",
-                "unmute": "#ADFF2F",
-                "success": "#00FF00",
-                "error": "#FF0000",
-                "info": "#00BFFF"
+                action_type: f"#{color:06X}" for action_type, color in _EMBED_COLORS.items()
             },
             "rate_limit": {
                 "enabled": True,
@@ -652,17 +893,49 @@ class ModerationCog(commands.Cog):
         }
 
     
-    def cog_unload(self):
+    async def cog_unload(self):
         """Cleanup quando il cog viene scaricato"""
-        self.cleanup_task.cancel()
-        self.restore_temp_actions.cancel()
-        
-        # Cancella tutti i task temporanei
-        for task in self.temp_actions.values():
+        # Cancella loop, task temporanei e in background e attende che terminino davvero
+        pending = []
+        for loop in (self.cleanup_task, self.restore_temp_actions, self.rate_limit_cleanup):
+            task = loop.get_task()
+            loop.cancel()
+            if task:
+                pending.append(task)
+        pending += list(self.temp_actions.values()) + list(self._bg_tasks)
+        if self._expiry_task:
+            pending.append(self._expiry_task)
+        for task in pending:
             task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        self.temp_actions.clear()
+        self._bg_tasks.clear()
+        self._expiry_heap.clear()
+        self._expiry_task = None
+        
+        # _db() rilascia il lock solo a query finita: nessuna query in corso alla chiusura
+        async with self._db_lock:
+            self.db.close()
+        self._stop_logger()
     
     # ===== UTILITY FUNCTIONS =====
     
+    async def _db(self, func, *args, **kwargs):
+        """Esegue una chiamata a ModerationDatabase in un thread, senza bloccare l'event loop"""
+        async with self._db_lock:
+            fut = asyncio.get_running_loop().run_in_executor(None, partial(func, *args, **kwargs))
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # Il thread non si può interrompere: il lock resta preso finché la query non termina
+                while not fut.done():
+                    try:
+                        await asyncio.wait((fut,))
+                    except asyncio.CancelledError:
+                        pass
+                raise
+    
     def _parse_duration(self, duration_str: str) -> Optional[int]:
         """
         Parse durata flessibile in formato Nt dove N=numero, t=tipo
@@ -683,51 +956,18 @@ class ModerationCog(commands.Cog):
         if not duration_str:
             return None
         
-        # Regex per catturare numero + unità
-        pattern = r'^(\d+)([smhdwMy])$'
-        match = re.match(pattern, duration_str)
-        
+        match = _DURATION_RE.match(duration_str)
         if not match:
             return None
         
-        amount = int(match.group(1))
-        unit = match.group(2)
-        
-        # Conversioni in secondi
-        conversions = {
-            's': 1,              # secondi
-            'm': 60,             # minuti
-            'h': 3600,           # ore
-            'd': 86400,          # giorni
-            'w': 604800,         # settimane (7 giorni)
-            'M': 2592000,        # mesi (30 giorni)
-            'y': 31536000        # anni (365 giorni)
-        }
-        
-        return amount * conversions[unit]
+        return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
     
     def _format_duration(self, seconds: int) -> str:
         """Formatta secondi in stringa leggibile"""
-        if seconds >= 31536000:  # >= 1 anno
-            years = seconds // 31536000
-            return f"{years} anno/i"
-        elif seconds >= 2592000:  # >= 1 mese
-            months = seconds // 2592000
-            return f"{months} mese/i"
-        elif seconds >= 604800:  # >= 1 settimana
-            weeks = seconds // 604800
-            return f"{weeks} settimana/e"
-        elif seconds >= 86400:  # >= 1 giorno
-            days = seconds // 86400
-            return f"{days} giorno/i"
-        elif seconds >= 3600:  # >= 1 ora
-            hours = seconds // 3600
-            return f"{hours} ora/e"
-        elif seconds >= 60:  # >= 1 minuto
-            minutes = seconds // 60
-            return f"{minutes} minuto/i"
-        else:
-            return f"{seconds} secondo/i"
+        for unit_seconds, label in _DURATION_LABELS:
+            if seconds >= unit_seconds:
+                return f"{seconds // unit_seconds} {label}"
+        return f"{seconds} secondo/i"
     
     def _check_permissions(self, member: discord.Member, required_level: str = "staff") -> bool:
         """
@@ -740,6 +980,19 @@ class ModerationCog(commands.Cog):
         Returns:
             bool: True se ha i permessi
         """
+        # Esito recente in cache (invalidato ai cambi di ruolo in on_member_update)
+        key = (member.id, member.guild.id, required_level)
+        now = time.monotonic()
+        cached = self._perm_cache.get(key)
+        if cached and now - cached[0] < self.PERMISSION_CACHE_TTL:
+            return cached[1]
+        
+        allowed = self._compute_permissions(member, required_level)
+        self._perm_cache[key] = (now, allowed)
+        return allowed
+    
+    def _compute_permissions(self, member: discord.Member, required_level: str) -> bool:
+        """Calcola i permessi di un membro (senza cache)"""
         # Owner del bot bypassa tutto
         if member.id == self.bot.owner_id:
             return True
@@ -748,15 +1001,13 @@ class ModerationCog(commands.Cog):
         if member.guild_permissions.administrator:
             return True
         
-        # Controlla ruoli configurati
-        member_role_ids = [role.id for role in member.roles]
+        # Controlla ruoli configurati (intersezione di insiemi)
+        member_role_ids = {role.id for role in member.roles}
         
         if required_level == "admin":
-            return any(role_id in self.config.get("admin_roles", []) for role_id in member_role_ids)
-        else:  # staff
-            staff_check = any(role_id in self.config.get("staff_roles", []) for role_id in member_role_ids)
-            admin_check = any(role_id in self.config.get("admin_roles", []) for role_id in member_role_ids)
-            return staff_check or admin_check
+            return not member_role_ids.isdisjoint(self._admin_role_ids)
+        # staff (gli admin sono inclusi)
+        return not member_role_ids.isdisjoint(self._mod_role_ids)
     
     def _check_rate_limit(self, user_id: int) -> bool:
         """
@@ -765,25 +1016,23 @@ class ModerationCog(commands.Cog):
         Returns:
             bool: True se può procedere, False se rate limited
         """
-        if not self.config.get("rate_limit", {}).get("enabled", False):
+        if not self._rl_enabled:
             return True
         
-        now = datetime.now()
-        max_commands = int(self.config["rate_limit"]["max_commands"])
-        time_window = int(self.config["rate_limit"]["per_seconds"])
+        now = time.monotonic()
+        timestamps = self.rate_limit_tracker[user_id]
         
-        # Rimuovi timestamp vecchi
-        cutoff = now - timedelta(seconds=time_window)
-        self.rate_limit_tracker[user_id] = [
-            ts for ts in self.rate_limit_tracker[user_id] if ts > cutoff
-        ]
+        # Rimuovi timestamp vecchi (sono in ordine: basta guardare la testa)
+        cutoff = now - self._rl_window
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
         
         # Controlla limite
-        if len(self.rate_limit_tracker[user_id]) >= max_commands:
+        if len(timestamps) >= self._rl_max:
             return False
         
         # Aggiungi nuovo timestamp
-        self.rate_limit_tracker[user_id].append(now)
+        timestamps.append(now)
         return True
     
     def _create_embed(self, action_type: str, title: str, description: str, 
@@ -791,8 +1040,7 @@ class ModerationCog(commands.Cog):
                       user: Optional[Union[discord.User, discord.Member]] = None) -> discord.Embed:
         """Crea un embed personalizzato per le azioni di moderazione"""
         if color is None:
-            color_hex = self.config.get("embed_colors", {}).get(action_type, "#5865F2")
-            color = int(color_hex.replace("#", ""), 16)
+            color = self._colors.get(action_type, _EMBED_COLOR_FALLBACK)
         
         embed = discord.Embed(
             title=title,
@@ -815,27 +1063,22 @@ class ModerationCog(commands.Cog):
     
     async def _send_to_log(self, guild: discord.Guild, embed: discord.Embed):
         """Invia embed al canale log se configurato"""
-        log_channel_id = self.config.get("log_channel_id")
+        log_channel_id = self._log_channel_id
         if not log_channel_id:
             return
-            
-        try:
-            log_channel_id = int(log_channel_id)
-        except (ValueError, TypeError):
-            return
         
         log_channel = guild.get_channel(log_channel_id)
         if log_channel and isinstance(log_channel, discord.TextChannel):
             try:
                 await log_channel.send(embed=embed)
             except discord.Forbidden:
-                print(f"⚠️  {get_text('moderation.log_send_error', channel_id=log_channel_id)}")
+                logger.warning("⚠️ %s", get_text('moderation.log_send_error', channel_id=log_channel_id))
             except Exception as e:
-                print(f"❌ {get_text('moderation.log_error', error=e)}")
+                logger.exception("❌ %s", get_text('moderation.log_error', error=e))
     
     async def _send_dm(self, user: discord.User, embed: discord.Embed) -> bool:
         """Invia DM all'utente se abilitato"""
-        if not self.config.get("dm_users", True):
+        if not self._dm_users:
             return False
         
         try:
@@ -846,17 +1089,56 @@ class ModerationCog(commands.Cog):
         except Exception:
             return False
     
+    async def _send_confirmation(self, interaction: discord.Interaction, embed: discord.Embed):
+        """Conferma pubblica dopo un defer ephemeral"""
+        # Un followup qui modificherebbe il "sta pensando..." ephemeral: l'embed va nel canale
+        # e il messaggio ephemeral viene rimosso, in parallelo
+        await asyncio.gather(
+            interaction.channel.send(embed=embed),
+            interaction.delete_original_response()
+        )
+    
+    async def _send_error(self, interaction: discord.Interaction, message: str):
+        """Messaggio di errore ephemeral, come followup se l'interazione è già stata differita"""
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+    
+    async def _send_log_with_dm(self, guild: discord.Guild, embed: discord.Embed, dm_task: asyncio.Task):
+        """Invia al canale log una copia dell'embed con l'esito del DM avviato con _spawn"""
+        await asyncio.wait({dm_task}, timeout=self.DM_TIMEOUT)
+        if not dm_task.done():
+            dm_status = "⏳ In corso"
+        elif not dm_task.cancelled() and dm_task.result():
+            dm_status = "✅ Sì"
+        else:
+            dm_status = "❌ No"
+        
+        log_embed = embed.copy()
+        log_embed.add_field(name="DM Inviato", value=dm_status, inline=True)
+        await self._send_to_log(guild, log_embed)
+    
     async def _get_or_create_mute_role(self, guild: discord.Guild) -> Optional[discord.Role]:
         """Ottiene o crea il ruolo mute"""
+        # Ruolo già risolto per questa guild (discord.py aggiorna l'oggetto Role in place;
+        # se viene eliminato la entry viene rimossa in on_guild_role_delete)
+        role = self._mute_role_cache.get(guild.id)
+        if role:
+            return role
+        
+        role = await self._resolve_mute_role(guild)
+        if role:
+            self._mute_role_cache[guild.id] = role
+        return role
+    
+    async def _resolve_mute_role(self, guild: discord.Guild) -> Optional[discord.Role]:
+        """Cerca il ruolo mute (ID configurato, poi nome) o lo crea"""
         # Controlla se configurato
-        mute_role_id = self.config.get("mute_role_id")
-        if mute_role_id:
-            try:
-                role = guild.get_role(int(mute_role_id))
-                if role:
-                    return role
-            except (ValueError, TypeError):
-                pass
+        if self._mute_role_id:
+            role = guild.get_role(self._mute_role_id)
+            if role:
+                return role
         
         # Cerca per nome
         mute_role_name = self.config.get("mute_role_name", "Muted")
@@ -869,90 +1151,198 @@ class ModerationCog(commands.Cog):
             role = await guild.create_role(
                 name=mute_role_name,
                 color=discord.Color.dark_gray(),
+                permissions=discord.Permissions.none(),
                 reason="Ruolo mute auto-creato dal sistema di moderazione"
             )
             
-            # Imposta permessi per tutti i canali
-            for channel in guild.channels:
-                try:
-                    await channel.set_permissions(
-                        role,
-                        send_messages=False,
-                        send_messages_in_threads=False,
-                        create_public_threads=False,
-                        create_private_threads=False,
-                        add_reactions=False,
-                        speak=False
-                    )
-                except:
-                    pass  # Ignora errori su canali specifici
+            # Overwrite su tutti i canali in background: su guild con centinaia di canali
+            # richiede secondi e non deve ritardare la risposta al primo /mute
+            self._spawn(self._apply_mute_overwrites(guild, role))
             
             return role
         except discord.Forbidden:
             return None
     
+    async def _apply_mute_overwrites(self, guild: discord.Guild, role: discord.Role):
+        """Nega al ruolo mute scrittura/reazioni/voce su tutti i canali della guild"""
+        # Massimo MUTE_OVERWRITE_CONCURRENCY richieste insieme, per non saturare il rate limit
+        semaphore = asyncio.Semaphore(self.MUTE_OVERWRITE_CONCURRENCY)
+        
+        async def set_overwrite(channel):
+            async with semaphore:
+                await channel.set_permissions(
+                    role,
+                    send_messages=False,
+                    send_messages_in_threads=False,
+                    create_public_threads=False,
+                    create_private_threads=False,
+                    add_reactions=False,
+                    speak=False
+                )
+        
+        # return_exceptions: gli errori su canali specifici vengono ignorati
+        await asyncio.gather(
+            *(set_overwrite(channel) for channel in guild.channels),
+            return_exceptions=True
+        )
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """Invalida la cache se viene eliminato il ruolo mute"""
+        cached = self._mute_role_cache.get(role.guild.id)
+        if cached and cached.id == role.id:
+            del self._mute_role_cache[role.guild.id]
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Il bot ha lasciato la guild: il ruolo in cache non serve più"""
+        self._mute_role_cache.pop(guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Invalida i permessi in cache se cambiano i ruoli del membro"""
+        if before.roles != after.roles:
+            for level in ("staff", "admin"):
+                self._perm_cache.pop((after.id, after.guild.id, level), None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Invalida i permessi in cache se cambiano i permessi di un ruolo (es. amministratore)"""
+        if before.permissions != after.permissions:
+            self._perm_cache.clear()
+    
     # ===== TASK MANAGEMENT =====
     
+    def _schedule_expiry(self, kind: str, action_id: int, user_id: int, guild_id: int,
+                         expires_at: float):
+        """Aggiunge un ban/mute temporaneo allo scheduler delle scadenze"""
+        heapq.heappush(self._expiry_heap, (expires_at, kind, action_id, user_id, guild_id))
+        # Sveglia lo scheduler: la nuova scadenza potrebbe essere la più vicina
+        self._expiry_wakeup.set()
+    
+    async def _expiry_scheduler(self):
+        """
+        Un solo task per tutte le scadenze: dorme fino alla prima in coda
+        (o finché non ne arriva una nuova) invece di un task in sleep per ogni azione
+        """
+        await self.bot.wait_until_ready()
+        
+        while True:
+            self._expiry_wakeup.clear()
+            
+            if not self._expiry_heap:
+                await self._expiry_wakeup.wait()
+                continue
+            
+            delay = self._expiry_heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._expiry_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            _, kind, action_id, user_id, guild_id = heapq.heappop(self._expiry_heap)
+            action = self._auto_unban if kind == "ban" else self._auto_unmute
+            self._track_task(f"{kind}_{action_id}", action(user_id, guild_id))
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Avvia un task in background tenendone un riferimento finché non termina"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    def _track_task(self, key: str, coro) -> asyncio.Task:
+        """Avvia un task temporaneo e lo tiene in temp_actions finché non termina"""
+        task = asyncio.create_task(coro)
+        self.temp_actions[key] = task
+        # Rimuove la entry a fine task (completato o cancellato), solo se è ancora la sua
+        task.add_done_callback(
+            lambda t, k=key: self.temp_actions.pop(k, None) if self.temp_actions.get(k) is t else None
+        )
+        return task
+    
     @tasks.loop(minutes=5)
     async def cleanup_task(self):
         """Task periodico per pulizia ban/mute scaduti"""
-        try:
-            result = self.db.cleanup_expired()
-            if result["bans"] > 0 or result["mutes"] > 0:
-                print(f"🧹 {get_text('moderation.cleanup', bans=result['bans'], mutes=result['mutes'])}")
-        except Exception as e:
-            print(f"❌ {get_text('moderation.cleanup_error', error=e)}")
+        # Un solo cleanup alla volta: in questo processo...
+        if self._cleanup_lock.locked():
+            return
+        
+        async with self._cleanup_lock:
+            acquired = False
+            try:
+                # ...e tra processi che condividono il database
+                acquired = await self._db(self.db.acquire_lock, "cleanup", 300)
+                if not acquired:
+                    return
+                
+                # Una tabella alla volta: tra le due i comandi possono usare il database
+                start = time.perf_counter()
+                expired_bans = await self._db(self.db.cleanup_expired_bans)
+                bans_ms = (time.perf_counter() - start) * 1000
+                
+                start = time.perf_counter()
+                expired_mutes = await self._db(self.db.cleanup_expired_mutes)
+                mutes_ms = (time.perf_counter() - start) * 1000
+                
+                if expired_bans > 0 or expired_mutes > 0:
+                    logger.info("🧹 %s (bans: %.0fms, mutes: %.0fms)",
+                                get_text('moderation.cleanup', bans=expired_bans, mutes=expired_mutes),
+                                bans_ms, mutes_ms)
+            except Exception as e:
+                logger.exception("❌ %s", get_text('moderation.cleanup_error', error=e))
+            finally:
+                if acquired:
+                    await self._db(self.db.release_lock, "cleanup")
     
     @cleanup_task.before_loop
     async def before_cleanup(self):
         """Attendi che il bot sia pronto prima di iniziare il task"""
         await self.bot.wait_until_ready()
+    @tasks.loop(seconds=60)
+    async def rate_limit_cleanup(self):
+        """Task periodico: rimuove dal tracker gli utenti senza comandi nella finestra e i permessi scaduti"""
+        cutoff = time.monotonic() - self._rl_window
+        stale = [
+            user_id for user_id, timestamps in self.rate_limit_tracker.items()
+            if not timestamps or timestamps[-1] <= cutoff
+        ]
+        for user_id in stale:
+            del self.rate_limit_tracker[user_id]
+        
+        # Permessi in cache scaduti
+        perm_cutoff = time.monotonic() - self.PERMISSION_CACHE_TTL
+        expired = [key for key, (ts, _) in self._perm_cache.items() if ts <= perm_cutoff]
+        for key in expired:
+            del self._perm_cache[key]
+    
     @tasks.loop(count=1)
     async def restore_temp_actions(self):
         """Ripristina ban/mute temporanei dopo restart del bot"""
         await self.bot.wait_until_ready()
         
         try:
-            # Ripristina ban temporanei
-            active_bans = self.db.get_active_bans()
-            for ban in active_bans:
-                if ban['expires_at'] and ban['duration']:
-                    expires_at = datetime.fromisoformat(ban['expires_at'])
-                    if expires_at > datetime.now():
-                        # Crea task per auto-unban
-                        delay = (expires_at - datetime.now()).total_seconds()
-                        task = asyncio.create_task(self._auto_unban(
-                            ban['user_id'], 
-                            ban['guild_id'], 
-                            delay
-                        ))
-                        self.temp_actions[f"ban_{ban['id']}"] = task
-            
-            # Ripristina mute temporanei
-            active_mutes = self.db.get_active_mutes()
-            for mute in active_mutes:
-                if mute['expires_at'] and mute['duration']:
-                    expires_at = datetime.fromisoformat(mute['expires_at'])
-                    if expires_at > datetime.now():
-                        # Crea task per auto-unmute
-                        delay = (expires_at - datetime.now()).total_seconds()
-                        task = asyncio.create_task(self._auto_unmute(
-                            mute['user_id'], 
-                            mute['guild_id'], 
-                            delay
-                        ))
-                        self.temp_actions[f"mute_{mute['id']}"] = task
-            
-            if active_bans or active_mutes:
-                print(f"🔄 {get_text('moderation.restore', bans=len(active_bans), mutes=len(active_mutes))}")
+            # Ban e mute temporanei ancora da far scadere, in una sola query
+            # (expires_at è un unix timestamp, già filtrato su "adesso" in SQL)
+            rows = await self._db(self.db.get_active_temp_actions, time.time())
+            
+            counts = {"ban": 0, "mute": 0}
+            for row in rows:
+                # Programma auto-unban / auto-unmute
+                self._schedule_expiry(row['kind'], row['id'], row['user_id'],
+                                      row['guild_id'], row['expires_at'])
+                counts[row['kind']] += 1
+            
+            if rows:
+                logger.info("🔄 %s", get_text('moderation.restore', bans=counts["ban"], mutes=counts["mute"]))
                 
         except Exception as e:
-            print(f"❌ {get_text('moderation.restore_error', error=e)}")
+            logger.exception("❌ %s", get_text('moderation.restore_error', error=e))
     
-    async def _auto_unban(self, user_id: int, guild_id: int, delay: float):
-        """Task per auto-unban dopo delay"""
-        await asyncio.sleep(delay)
-        
+    async def _auto_unban(self, user_id: int, guild_id: int):
+        """Auto-unban alla scadenza (chiamato dallo scheduler)"""
         try:
             guild = self.bot.get_guild(guild_id)
             if not guild:
@@ -964,7 +1354,7 @@ class ModerationCog(commands.Cog):
             
             # Rimuovi ban
             await guild.unban(user, reason="Ban temporaneo scaduto")
-            self.db.remove_ban(user_id, guild_id)
+            await self._db(self.db.remove_ban, user_id, guild_id)
             
             # Log
             embed = self._create_embed(
@@ -981,12 +1371,10 @@ class ModerationCog(commands.Cog):
             await self._send_to_log(guild, embed)
             
         except Exception as e:
-            print(f"❌ {get_text('moderation.auto_unban_error', error=e)}")
+            logger.exception("❌ %s", get_text('moderation.auto_unban_error', error=e))
     
-    async def _auto_unmute(self, user_id: int, guild_id: int, delay: float):
-        """Task per auto-unmute dopo delay"""
-        await asyncio.sleep(delay)
-        
+    async def _auto_unmute(self, user_id: int, guild_id: int):
+        """Auto-unmute alla scadenza (chiamato dallo scheduler)"""
         try:
             guild = self.bot.get_guild(guild_id)
             if not guild:
@@ -1002,7 +1390,7 @@ class ModerationCog(commands.Cog):
             
             # Rimuovi ruolo
             await member.remove_roles(mute_role, reason="Mute temporaneo scaduto")
-            self.db.remove_mute(user_id, guild_id)
+            await self._db(self.db.remove_mute, user_id, guild_id)
             
             # Log
             embed = self._create_embed(
@@ -1019,7 +1407,7 @@ class ModerationCog(commands.Cog):
             await self._send_to_log(guild, embed)
             
         except Exception as e:
-            print(f"❌ {get_text('moderation.auto_unmute_error', error=e)}")
+            logger.exception("❌ %s", get_text('moderation.auto_unmute_error', error=e))
     
     # ===== SLASH COMMANDS =====
     
@@ -1028,36 +1416,18 @@ class ModerationCog(commands.Cog):
         user="L'utente da avvertire",
         reason="Motivo del warn (opzionale)"
     )
+    @_moderator_check("staff", "warnare", rate_limit=True, any_bot=True, top_role=False)
     async def warn_command(self, interaction: discord.Interaction, user: discord.Member, reason: Optional[str] = None):
         """Comando /warn - Avverte un utente"""
         
-        # Controlla permessi
-        if not self._check_permissions(interaction.user, "staff"):
-            await interaction.response.send_message("❌ Non hai i permessi per usare questo comando!", ephemeral=True)
-            return
-        
-        # Rate limiting
-        if not self._check_rate_limit(interaction.user.id):
-            await interaction.response.send_message(
-                "⏱️ Stai usando troppi comandi di moderazione! Riprova tra qualche secondo.",
-                ephemeral=True
-            )
-            return
-        
-        # Non può warnare se stesso
-        if user == interaction.user:
-            await interaction.response.send_message("❌ Non puoi warnare te stesso!", ephemeral=True)
-            return
-        
-        # Non può warnare il bot
-        if user.bot:
-            await interaction.response.send_message("❌ Non puoi warnare un bot!", ephemeral=True)
-            return
-        
         try:
+            # Da qui DB, DM, sanzione e log possono superare i 3s concessi per la risposta.
+            # Defer ephemeral: gli errori restano visibili solo al moderatore
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            
             # Aggiungi warn al database
-            warn_id = self.db.add_warn(user.id, interaction.user.id, interaction.guild.id, reason)
-            warn_count = self.db.get_warn_count(user.id, interaction.guild.id)
+            warn_id, warn_count = await self._db(self.db.add_warn_and_count, user.id, interaction.user.id,
+                                                 interaction.guild.id, reason)
             
             # Embed per conferma
             reason_text = reason or "Nessun motivo specificato"
@@ -1065,11 +1435,10 @@ class ModerationCog(commands.Cog):
             warn_info += f"**Utente:** {user.mention} ({user.id})\n"
             warn_info += f"**Moderatore:** {interaction.user.mention}\n"
             warn_info += f"**Motivo:** {reason_text}\n"
-            if self.config.get("show_warn_count", True):
+            if self._show_warn_count:
                 warn_info += f"**Warn Totali:** {warn_count}"
             
             embed = self._create_embed("warn", "🚨 Warn Assegnato", warn_info, user=user)
-            await interaction.response.send_message(embed=embed)
             
             # DM all'utente
             dm_embed = self._create_embed(
@@ -1081,7 +1450,12 @@ class ModerationCog(commands.Cog):
                 f"⚠️ Comportati meglio per evitare ulteriori sanzioni!",
                 user=user
             )
-            dm_sent = await self._send_dm(user, dm_embed)
+            
+            # Conferma e DM in parallelo (il log sul canale attende l'esito del DM)
+            _, dm_sent = await asyncio.gather(
+                self._send_confirmation(interaction, embed),
+                self._send_dm(user, dm_embed)
+            )
             
             # Log su file
             self._log_to_file("WARN", user, interaction.user, reason_text, f"Warn Count: {warn_count}")
@@ -1092,16 +1466,13 @@ class ModerationCog(commands.Cog):
             await self._send_to_log(interaction.guild, log_embed)
             
             # Auto-actions se abilitati
-            if self.config.get("auto_actions", {}).get("enabled", False):
-                auto_ban_warns = int(self.config["auto_actions"].get("auto_ban_warns", 5))
-                auto_mute_warns = int(self.config["auto_actions"].get("auto_mute_warns", 3))
-                
-                if warn_count >= auto_ban_warns:
+            if self._auto_enabled:
+                if warn_count >= self._auto_ban_warns:
                     # Auto-ban
                     try:
                         await user.ban(reason=f"Auto-ban: raggiunti {warn_count} warn")
-                        self.db.add_ban(user.id, self.bot.user.id, interaction.guild.id, 
-                                      f"Auto-ban per {warn_count} warn")
+                        await self._db(self.db.add_ban, user.id, self.bot.user.id, interaction.guild.id, 
+                                       f"Auto-ban per {warn_count} warn")
                         
                         auto_embed = self._create_embed(
                             "ban",
@@ -1113,19 +1484,20 @@ class ModerationCog(commands.Cog):
                         # Log su file
                         self._log_to_file("AUTO-BAN", user, self.bot.user, f"Raggiunti {warn_count} warn")
                         
-                        await interaction.followup.send(embed=auto_embed)
-                        await self._send_to_log(interaction.guild, auto_embed)
+                        await asyncio.gather(
+                            interaction.channel.send(embed=auto_embed),
+                            self._send_to_log(interaction.guild, auto_embed)
+                        )
                     except:
                         pass
                 
-                elif warn_count >= auto_mute_warns:
-                    # Auto-mute
-                    mute_role = await self._get_or_create_mute_role(interaction.guild)
-                    if mute_role and mute_role not in user.roles:
+                elif warn_count >= self._auto_mute_warns:
+                    # Auto-mute (1 ora): timeout nativo, lo fa scadere Discord
+                    if not user.is_timed_out():
                         try:
-                            await user.add_roles(mute_role, reason=f"Auto-mute: raggiunti {warn_count} warn")
-                            self.db.add_mute(user.id, self.bot.user.id, interaction.guild.id,
-                                           f"Auto-mute per {warn_count} warn", 3600)  # 1 ora
+                            await user.timeout(timedelta(hours=1), reason=f"Auto-mute: raggiunti {warn_count} warn")
+                            await self._db(self.db.add_mute, user.id, self.bot.user.id, interaction.guild.id,
+                                            f"Auto-mute per {warn_count} warn", 3600, True)
                             
                             auto_embed = self._create_embed(
                                 "mute",
@@ -1137,13 +1509,15 @@ class ModerationCog(commands.Cog):
                             # Log su file
                             self._log_to_file("AUTO-MUTE", user, self.bot.user, f"Raggiunti {warn_count} warn", "Duration: 1h")
                             
-                            await interaction.followup.send(embed=auto_embed)
-                            await self._send_to_log(interaction.guild, auto_embed)
+                            await asyncio.gather(
+                                interaction.channel.send(embed=auto_embed),
+                                self._send_to_log(interaction.guild, auto_embed)
+                            )
                         except:
                             pass
         
         except Exception as e:
-            await interaction.response.send_message(f"❌ Errore: {e}", ephemeral=True)
+            await self._send_error(interaction, f"❌ Errore: {e}")
     
     @app_commands.command(name="unwarn", description="Rimuove un warn da un utente")
     @app_commands.describe(
@@ -1161,10 +1535,10 @@ class ModerationCog(commands.Cog):
         try:
             # Rimuovi warn
             if warn_id:
-                removed = self.db.remove_warn(warn_id=warn_id)
+                removed = await self._db(self.db.remove_warn, warn_id=warn_id)
                 warn_text = f"Warn #{warn_id}"
             else:
-                removed = self.db.remove_warn(user_id=user.id, guild_id=interaction.guild.id)
+                removed = await self._db(self.db.remove_warn, user_id=user.id, guild_id=interaction.guild.id)
                 warn_text = "ultimo warn"
             
             if not removed:
@@ -1175,7 +1549,7 @@ class ModerationCog(commands.Cog):
                 return
             
             # Conta warn rimanenti
-            remaining_warns = self.db.get_warn_count(user.id, interaction.guild.id)
+            remaining_warns = await self._db(self.db.get_warn_count, user.id, interaction.guild.id)
             
             # Embed
             embed = self._create_embed(
@@ -1191,8 +1565,11 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("UNWARN", user, interaction.user, "N/A", f"Removed: {warn_text}")
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo
+            await asyncio.gather(
+                interaction.response.send_message(embed=embed),
+                self._send_to_log(interaction.guild, embed)
+            )
             
         except Exception as e:
             await interaction.response.send_message(f"❌ Errore: {e}", ephemeral=True)
@@ -1202,30 +1579,17 @@ class ModerationCog(commands.Cog):
         user="L'utente da espellere",
         reason="Motivo del kick (opzionale)"
     )
+    @_moderator_check("staff", "kickare")
     async def kick_command(self, interaction: discord.Interaction, user: discord.Member, reason: Optional[str] = None):
         """Comando /kick - Espelle un utente"""
         
-        # Controlla permessi
-        if not self._check_permissions(interaction.user, "staff"):
-            await interaction.response.send_message("❌ Non hai i permessi per usare questo comando!", ephemeral=True)
-            return
-        
-        # Controlli di sicurezza
-        if user == interaction.user:
-            await interaction.response.send_message("❌ Non puoi kickare te stesso!", ephemeral=True)
-            return
-        
-        if user.bot and user.id == self.bot.user.id:
-            await interaction.response.send_message("❌ Non puoi kickare il bot!", ephemeral=True)
-            return
-        
-        if user.top_role >= interaction.user.top_role:
-            await interaction.response.send_message("❌ Non puoi kickare qualcuno con un ruolo superiore o uguale al tuo!", ephemeral=True)
-            return
-        
         try:
             reason_text = reason or "Nessun motivo specificato"
             
+            # Da qui DB, DM, sanzione e log possono superare i 3s concessi per la risposta.
+            # Defer ephemeral: gli errori restano visibili solo al moderatore
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            
             # DM prima del kick
             dm_embed = self._create_embed(
                 "kick",
@@ -1233,13 +1597,16 @@ class ModerationCog(commands.Cog):
                 f"**Moderatore:** {interaction.user.name}\n"
                 f"**Motivo:** {reason_text}"
             )
-            await self._send_dm(user, dm_embed)
+            dm_task = self._spawn(self._send_dm(user, dm_embed))
+            # Dopo il kick l'utente potrebbe non essere più raggiungibile: il DM parte prima,
+            # ma un DM lento (rate limit) non blocca la sanzione oltre DM_TIMEOUT
+            await asyncio.wait({dm_task}, timeout=self.DM_TIMEOUT)
             
             # Esegui kick
             await user.kick(reason=reason_text)
             
             # Salva in DB
-            self.db.add_kick(user.id, interaction.user.id, interaction.guild.id, reason)
+            await self._db(self.db.add_kick, user.id, interaction.user.id, interaction.guild.id, reason)
             
             # Embed conferma
             embed = self._create_embed(
@@ -1254,13 +1621,16 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("KICK", user, interaction.user, reason_text)
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo
+            await asyncio.gather(
+                self._send_confirmation(interaction, embed),
+                self._send_log_with_dm(interaction.guild, embed, dm_task)
+            )
             
         except discord.Forbidden:
-            await interaction.response.send_message("❌ Non ho i permessi per kickare questo utente!", ephemeral=True)
+            await self._send_error(interaction, "❌ Non ho i permessi per kickare questo utente!")
         except Exception as e:
-            await interaction.response.send_message(f"❌ Errore: {e}", ephemeral=True)
+            await self._send_error(interaction, f"❌ Errore: {e}")
     
     @app_commands.command(name="ban", description="Bandisce un utente dal server")
     @app_commands.describe(
@@ -1268,28 +1638,11 @@ class ModerationCog(commands.Cog):
         duration="Durata del ban (es: 30m, 2h, 7d) - lascia vuoto per permanente",
         reason="Motivo del ban (opzionale)"
     )
+    @_moderator_check("admin", "bannare", denied="❌ Solo gli admin possono bannare!")
     async def ban_command(self, interaction: discord.Interaction, user: discord.Member, 
                          duration: Optional[str] = None, reason: Optional[str] = None):
         """Comando /ban - Bandisce un utente (permanente o temporaneo)"""
         
-        # Controlla permessi
-        if not self._check_permissions(interaction.user, "admin"):
-            await interaction.response.send_message("❌ Solo gli admin possono bannare!", ephemeral=True)
-            return
-        
-        # Controlli di sicurezza
-        if user == interaction.user:
-            await interaction.response.send_message("❌ Non puoi bannare te stesso!", ephemeral=True)
-            return
-        
-        if user.bot and user.id == self.bot.user.id:
-            await interaction.response.send_message("❌ Non puoi bannare il bot!", ephemeral=True)
-            return
-        
-        if user.top_role >= interaction.user.top_role:
-            await interaction.response.send_message("❌ Non puoi bannare qualcuno con un ruolo superiore o uguale al tuo!", ephemeral=True)
-            return
-        
         try:
             reason_text = reason or "Nessun motivo specificato"
             
@@ -1306,6 +1659,10 @@ class ModerationCog(commands.Cog):
                     return
                 duration_text = self._format_duration(duration_seconds)
             
+            # Da qui DB, DM, sanzione e log possono superare i 3s concessi per la risposta.
+            # Defer ephemeral: gli errori restano visibili solo al moderatore
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            
             # DM prima del ban
             dm_embed = self._create_embed(
                 "ban",
@@ -1314,18 +1671,21 @@ class ModerationCog(commands.Cog):
                 f"**Durata:** {duration_text}\n"
                 f"**Motivo:** {reason_text}"
             )
-            await self._send_dm(user, dm_embed)
+            dm_task = self._spawn(self._send_dm(user, dm_embed))
+            # Dopo il ban l'utente potrebbe non essere più raggiungibile: il DM parte prima,
+            # ma un DM lento (rate limit) non blocca la sanzione oltre DM_TIMEOUT
+            await asyncio.wait({dm_task}, timeout=self.DM_TIMEOUT)
             
             # Esegui ban
             await user.ban(reason=reason_text, delete_message_days=1)
             
             # Salva in DB
-            ban_id = self.db.add_ban(user.id, interaction.user.id, interaction.guild.id, reason, duration_seconds)
+            ban_id = await self._db(self.db.add_ban, user.id, interaction.user.id, interaction.guild.id, reason, duration_seconds)
             
             # Se temporaneo, crea task per auto-unban
             if duration_seconds:
-                task = asyncio.create_task(self._auto_unban(user.id, interaction.guild.id, duration_seconds))
-                self.temp_actions[f"ban_{ban_id}"] = task
+                self._schedule_expiry("ban", ban_id, user.id, interaction.guild.id,
+                                      time.time() + duration_seconds)
             
             # Embed conferma
             embed = self._create_embed(
@@ -1341,13 +1701,16 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("BAN", user, interaction.user, reason_text, f"Duration: {duration_text}")
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo
+            await asyncio.gather(
+                self._send_confirmation(interaction, embed),
+                self._send_log_with_dm(interaction.guild, embed, dm_task)
+            )
             
         except discord.Forbidden:
-            await interaction.response.send_message("❌ Non ho i permessi per bannare questo utente!", ephemeral=True)
+            await self._send_error(interaction, "❌ Non ho i permessi per bannare questo utente!")
         except Exception as e:
-            await interaction.response.send_message(f"❌ Errore: {e}", ephemeral=True)
+            await self._send_error(interaction, f"❌ Errore: {e}")
     
     @app_commands.command(name="unban", description="Rimuove il ban di un utente")
     @app_commands.describe(
@@ -1380,7 +1743,7 @@ class ModerationCog(commands.Cog):
             
             # Rimuovi ban
             await interaction.guild.unban(user, reason=reason_text)
-            self.db.remove_ban(uid, interaction.guild.id)
+            await self._db(self.db.remove_ban, uid, interaction.guild.id)
             
             # Embed
             embed = self._create_embed(
@@ -1395,8 +1758,11 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("UNBAN", user, interaction.user, reason_text)
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo
+            await asyncio.gather(
+                interaction.response.send_message(embed=embed),
+                self._send_to_log(interaction.guild, embed)
+            )
             
         except discord.NotFound:
             await interaction.response.send_message("❌ Utente non bannato!", ephemeral=True)
@@ -1411,40 +1777,12 @@ class ModerationCog(commands.Cog):
         duration="Durata del mute (es: 30m, 2h, 7d) - lascia vuoto per permanente",
         reason="Motivo del mute (opzionale)"
     )
+    @_moderator_check("staff", "mutare")
     async def mute_command(self, interaction: discord.Interaction, user: discord.Member,
                           duration: Optional[str] = None, reason: Optional[str] = None):
         """Comando /mute - Silenzia un utente"""
         
-        # Controlla permessi
-        if not self._check_permissions(interaction.user, "staff"):
-            await interaction.response.send_message("❌ Non hai i permessi per usare questo comando!", ephemeral=True)
-            return
-        
-        # Controlli di sicurezza
-        if user == interaction.user:
-            await interaction.response.send_message("❌ Non puoi mutare te stesso!", ephemeral=True)
-            return
-        
-        if user.bot and user.id == self.bot.user.id:
-            await interaction.response.send_message("❌ Non puoi mutare il bot!", ephemeral=True)
-            return
-        
-        if user.top_role >= interaction.user.top_role:
-            await interaction.response.send_message("❌ Non puoi mutare qualcuno con un ruolo superiore o uguale al tuo!", ephemeral=True)
-            return
-        
         try:
-            # Ottieni ruolo mute
-            mute_role = await self._get_or_create_mute_role(interaction.guild)
-            if not mute_role:
-                await interaction.response.send_message("❌ Impossibile ottenere il ruolo mute!", ephemeral=True)
-                return
-            
-            # Controlla se già mutato
-            if mute_role in user.roles:
-                await interaction.response.send_message(f"❌ {user.mention} è già mutato!", ephemeral=True)
-                return
-            
             reason_text = reason or "Nessun motivo specificato"
             
             # Parse durata
@@ -1460,18 +1798,35 @@ class ModerationCog(commands.Cog):
                     return
                 duration_text = self._format_duration(duration_seconds)
             
-            # Applica mute
-            await user.add_roles(mute_role, reason=reason_text)
+            if user.is_timed_out():
+                await interaction.response.send_message(f"❌ {user.mention} è già mutato!", ephemeral=True)
+                return
             
-            # Salva in DB
-            mute_id = self.db.add_mute(user.id, interaction.user.id, interaction.guild.id, reason, duration_seconds)
+            # Da qui DB, DM, sanzione e log possono superare i 3s concessi per la risposta.
+            # Defer ephemeral: gli errori restano visibili solo al moderatore
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            
+            # Entro 28 giorni: timeout nativo (nessun ruolo, overwrite o auto-unmute da gestire)
+            native_timeout = bool(duration_seconds and duration_seconds <= self.MAX_TIMEOUT_SECONDS)
+            mute_role = None
+            if not native_timeout:
+                # Permanente o oltre 28 giorni: ruolo mute (la prima volta viene creato, può essere lento)
+                mute_role = await self._get_or_create_mute_role(interaction.guild)
+                if not mute_role:
+                    await self._send_error(interaction, "❌ Impossibile ottenere il ruolo mute!")
+                    return
+                
+                # Controlla se già mutato
+                if mute_role in user.roles:
+                    await self._send_error(interaction, f"❌ {user.mention} è già mutato!")
+                    return
             
-            # Se temporaneo, crea task per auto-unmute
-            if duration_seconds:
-                task = asyncio.create_task(self._auto_unmute(user.id, interaction.guild.id, duration_seconds))
-                self.temp_actions[f"mute_{mute_id}"] = task
+            if native_timeout:
+                await user.timeout(timedelta(seconds=duration_seconds), reason=reason_text)
+            else:
+                await user.add_roles(mute_role, reason=reason_text)
             
-            # DM all'utente
+            # DM all'utente in background, in parallelo alla scrittura su DB
             dm_embed = self._create_embed(
                 "mute",
                 f"🔇 Silenziato in {interaction.guild.name}",
@@ -1479,7 +1834,16 @@ class ModerationCog(commands.Cog):
                 f"**Durata:** {duration_text}\n"
                 f"**Motivo:** {reason_text}"
             )
-            await self._send_dm(user, dm_embed)
+            dm_task = self._spawn(self._send_dm(user, dm_embed))
+            
+            # Salva in DB
+            mute_id = await self._db(self.db.add_mute, user.id, interaction.user.id, interaction.guild.id, reason,
+                                     duration_seconds, native_timeout)
+            
+            # Se temporaneo con ruolo, crea task per auto-unmute
+            if duration_seconds and not native_timeout:
+                self._schedule_expiry("mute", mute_id, user.id, interaction.guild.id,
+                                      time.time() + duration_seconds)
             
             # Embed conferma
             embed = self._create_embed(
@@ -1495,13 +1859,16 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("MUTE", user, interaction.user, reason_text, f"Duration: {duration_text}")
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo (il log attende l'esito del DM)
+            await asyncio.gather(
+                self._send_confirmation(interaction, embed),
+                self._send_log_with_dm(interaction.guild, embed, dm_task)
+            )
             
         except discord.Forbidden:
-            await interaction.response.send_message("❌ Non ho i permessi per mutare questo utente!", ephemeral=True)
+            await self._send_error(interaction, "❌ Non ho i permessi per mutare questo utente!")
         except Exception as e:
-            await interaction.response.send_message(f"❌ Errore: {e}", ephemeral=True)
+            await self._send_error(interaction, f"❌ Errore: {e}")
     
     @app_commands.command(name="unmute", description="Rimuove il silenziamento di un utente")
     @app_commands.describe(
@@ -1517,22 +1884,27 @@ class ModerationCog(commands.Cog):
             return
         
         try:
-            # Ottieni ruolo mute
-            mute_role = await self._get_or_create_mute_role(interaction.guild)
-            if not mute_role:
-                await interaction.response.send_message("❌ Ruolo mute non trovato!", ephemeral=True)
-                return
-            
-            # Controlla se è mutato
-            if mute_role not in user.roles:
-                await interaction.response.send_message(f"❌ {user.mention} non è mutato!", ephemeral=True)
-                return
-            
             reason_text = reason or "Nessun motivo specificato"
             
-            # Rimuovi ruolo
-            await user.remove_roles(mute_role, reason=reason_text)
-            self.db.remove_mute(user.id, interaction.guild.id)
+            if user.is_timed_out():
+                # Timeout nativo
+                await user.timeout(None, reason=reason_text)
+            else:
+                # Ottieni ruolo mute
+                mute_role = await self._get_or_create_mute_role(interaction.guild)
+                if not mute_role:
+                    await interaction.response.send_message("❌ Ruolo mute non trovato!", ephemeral=True)
+                    return
+                
+                # Controlla se è mutato
+                if mute_role not in user.roles:
+                    await interaction.response.send_message(f"❌ {user.mention} non è mutato!", ephemeral=True)
+                    return
+                
+                # Rimuovi ruolo
+                await user.remove_roles(mute_role, reason=reason_text)
+            
+            await self._db(self.db.remove_mute, user.id, interaction.guild.id)
             
             # Embed
             embed = self._create_embed(
@@ -1547,8 +1919,11 @@ class ModerationCog(commands.Cog):
             # Log su file
             self._log_to_file("UNMUTE", user, interaction.user, reason_text)
             
-            await interaction.response.send_message(embed=embed)
-            await self._send_to_log(interaction.guild, embed)
+            # Risposta e log sono indipendenti: in parallelo
+            await asyncio.gather(
+                interaction.response.send_message(embed=embed),
+                self._send_to_log(interaction.guild, embed)
+            )
             
         except discord.Forbidden:
             await interaction.response.send_message("❌ Non ho i permessi per smutare questo utente!", ephemeral=True)
@@ -6,39 +6,190 @@ System for managing support tickets.
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import json
 import os
+import queue
 import sqlite3
-import sys
-from typing import Optional, Dict, List
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Optional, Dict, List, Tuple
 
-# Add plugins directory to path to allow imports from tickets folder
-sys.path.append(os.path.dirname(__file__))
+from ._tickets import create_ticket, close_ticket, delete_ticket, claim_ticket, move_ticket, add_ticket_members
+from ._tickets.cache import GuildObjectCache
+from ._tickets.views import TicketPanelView, ReasonModal, build_category_options, controls_view, confirmation_view
 
-from tickets import create_ticket, close_ticket, delete_ticket, claim_ticket, move_ticket
-from tickets.views import TicketPanelView, TicketControlsView, ConfirmationView, ReasonModal
+# SQL statements as module constants: the text is identical on every call, so
+# each connection's statement cache prepares it once and reuses it
+
+_SQL_LAST_NUMBERS = """
+    SELECT guild_id, category_prefix, MAX(ticket_number) as max_num FROM tickets
+    GROUP BY guild_id, category_prefix
+"""
+
+_SQL_CREATE_TICKET = """
+    INSERT INTO tickets (channel_id, user_id, guild_id, category_prefix, ticket_number)
+    VALUES (?, ?, ?, ?, ?)
+    RETURNING id
+"""
+
+_SQL_CLOSE_TICKET = """
+    UPDATE tickets 
+    SET status = 'closed', closed_at = CURRENT_TIMESTAMP 
+    WHERE channel_id = ?
+"""
+
+_SQL_CLAIM_TICKET = """
+    UPDATE tickets 
+    SET claimed_by = ? 
+    WHERE channel_id = ?
+"""
+
+_SQL_DELETE_TICKET = """
+    UPDATE tickets 
+    SET status = 'deleted', closed_at = COALESCE(closed_at, CURRENT_TIMESTAMP) 
+    WHERE channel_id = ?
+"""
+
+# Only the columns the ticket helpers read; cached rows hold the same keys
+_SQL_GET_BY_CHANNEL = """
+    SELECT user_id, claimed_by, status, ticket_number FROM tickets
+    WHERE channel_id = ?
+"""
+
+_SQL_OPEN_TICKETS_COUNT = """
+    SELECT COUNT(*) as count FROM tickets 
+    WHERE user_id = ? AND guild_id = ? AND status = 'open'
+"""
+
+class SqlitePool:
+    """Bounded pool of read-only connections, opened lazily up to `size`"""
+    
+    def __init__(self, db_path: str, size: int = 4):
+        self.db_path = db_path
+        self.size = max(size, 1)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+    
+    def _take(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        # Pool exhausted: wait for another reader to give one back, unless the pool closes
+        while not self._closed:
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+    
+    def _release(self, conn: sqlite3.Connection):
+        with self._lock:
+            if not self._closed:
+                self._idle.put(conn)
+                return
+        conn.close()
+    
+    @contextmanager
+    def acquire(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+        conn = self._take()
+        if self._closed:
+            # Closed while we were waiting
+            self._release(conn)
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+    
+    def close(self):
+        # Connections still checked out are closed when they are given back
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
 
 class TicketsDatabase:
     """Manages the SQLite database for the tickets system"""
     
-    def __init__(self, db_path: str = "data/tickets.db"):
+    def __init__(self, db_path: str = "data/tickets.db", pool_size: int = 4):
         self.db_path = db_path
         self._ensure_data_directory()
+        
+        # One long-lived writer connection in autocommit mode
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                    cached_statements=512)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-64000")
+        # Writes may come from executor threads
+        self._write_lock = threading.Lock()
+        
         self._initialize_database()
+        
+        # Readers run in parallel on WAL, each on its own connection
+        self.readers = SqlitePool(self.db_path, pool_size)
+        
+        # Ticket rows by channel_id, kept in sync by the write methods below
+        self._by_channel: Dict[int, Dict] = {}
+        
+        # Last ticket number handed out per (guild_id, category_prefix)
+        self._last_num: Dict[Tuple[int, str], int] = {
+            (row['guild_id'], row['category_prefix']): row['max_num']
+            for row in self.conn.execute(_SQL_LAST_NUMBERS)
+        }
+        self._num_lock = threading.Lock()
+    
+    @contextmanager
+    def _txn(self):
+        # Writer connection, one thread at a time; a failed write never leaves a transaction open
+        with self._write_lock:
+            try:
+                yield self.conn
+            except Exception:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                raise
     
     def _ensure_data_directory(self):
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
-    def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def close(self):
+        self.readers.close()
+        # Waits for a write still running in a worker thread
+        with self._write_lock:
+            self.conn.close()
     
     def _initialize_database(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        self.conn.execute("""
             CREATE TABLE IF NOT EXISTS tickets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 channel_id INTEGER NOT NULL,
@@ -53,91 +204,103 @@ class TicketsDatabase:
             )
         """)
         
-        conn.commit()
-        conn.close()
+        # Ticket lookup by channel, next number per category, open tickets per user
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tickets_channel ON tickets(channel_id)")
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tickets_guild_prefix
+            ON tickets(guild_id, category_prefix, ticket_number DESC)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tickets_user_status
+            ON tickets(user_id, guild_id, status)
+        """)
         
     def create_ticket(self, channel_id: int, user_id: int, guild_id: int, category_prefix: str, ticket_number: int) -> int:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO tickets (channel_id, user_id, guild_id, category_prefix, ticket_number)
-            VALUES (?, ?, ?, ?, ?)
-        """, (channel_id, user_id, guild_id, category_prefix, ticket_number))
-        
-        ticket_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return ticket_id
+        with self._txn() as conn:
+            row = conn.execute(_SQL_CREATE_TICKET, (channel_id, user_id, guild_id, category_prefix, ticket_number)).fetchone()
+            self._by_channel[channel_id] = {
+                'user_id': user_id, 'claimed_by': None, 'status': 'open', 'ticket_number': ticket_number
+            }
+        return row['id']
 
     def get_next_ticket_number(self, guild_id: int, category_prefix: str) -> int:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Get max ticket number for this category
-        cursor.execute("""
-            SELECT MAX(ticket_number) as max_num FROM tickets 
-            WHERE guild_id = ? AND category_prefix = ?
-        """, (guild_id, category_prefix))
-        
-        result = cursor.fetchone()
-        current_max = result['max_num'] if result['max_num'] is not None else 0
-        
-        conn.close()
-        return current_max + 1
+        # Reserves the number: two tickets created at once never share it
+        key = (guild_id, category_prefix)
+        with self._num_lock:
+            number = (self._last_num.get(key) or 0) + 1
+            self._last_num[key] = number
+        return number
 
     def close_ticket(self, channel_id: int):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE tickets 
-            SET status = 'closed', closed_at = CURRENT_TIMESTAMP 
-            WHERE channel_id = ?
-        """, (channel_id,))
-        
-        conn.commit()
-        conn.close()
+        with self._txn() as conn:
+            conn.execute(_SQL_CLOSE_TICKET, (channel_id,))
+            ticket = self._by_channel.get(channel_id)
+            if ticket:
+                ticket['status'] = 'closed'
 
     def claim_ticket(self, channel_id: int, user_id: int):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE tickets 
-            SET claimed_by = ? 
-            WHERE channel_id = ?
-        """, (user_id, channel_id))
-        
-        conn.commit()
-        conn.close()
+        with self._txn() as conn:
+            conn.execute(_SQL_CLAIM_TICKET, (user_id, channel_id))
+            ticket = self._by_channel.get(channel_id)
+            if ticket:
+                ticket['claimed_by'] = user_id
+
+    def delete_ticket(self, channel_id: int):
+        # The row is kept for history; it just stops counting as open
+        with self._txn() as conn:
+            conn.execute(_SQL_DELETE_TICKET, (channel_id,))
+            self._by_channel.pop(channel_id, None)
 
     def get_ticket_by_channel(self, channel_id: int) -> Optional[Dict]:
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        ticket = self._by_channel.get(channel_id)
+        if ticket is not None:
+            return ticket
         
-        cursor.execute("SELECT * FROM tickets WHERE channel_id = ?", (channel_id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        # Tickets created before this process started. Read under the write lock, so no
+        # write can commit between the read and caching the row
+        with self._write_lock:
+            ticket = self._by_channel.get(channel_id)
+            if ticket is not None:
+                return ticket
+            row = self.conn.execute(_SQL_GET_BY_CHANNEL, (channel_id,)).fetchone()
+            if not row or row['status'] == 'deleted':
+                return None
+            ticket = self._by_channel[channel_id] = dict(row)
+        return ticket
 
     def get_open_tickets_count(self, user_id: int, guild_id: int) -> int:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM tickets 
-            WHERE user_id = ? AND guild_id = ? AND status = 'open'
-        """, (user_id, guild_id))
-        
-        count = cursor.fetchone()['count']
-        conn.close()
-        return count
+        with self.readers.acquire() as conn:
+            return conn.execute(_SQL_OPEN_TICKETS_COUNT, (user_id, guild_id)).fetchone()['count']
+
+    # Async variants: sqlite runs in a worker thread, never on the event loop
+
+    async def create_ticket_async(self, channel_id: int, user_id: int, guild_id: int,
+                                  category_prefix: str, ticket_number: int) -> int:
+        return await asyncio.to_thread(self.create_ticket, channel_id, user_id, guild_id,
+                                       category_prefix, ticket_number)
+
+    async def close_ticket_async(self, channel_id: int):
+        await asyncio.to_thread(self.close_ticket, channel_id)
+
+    async def claim_ticket_async(self, channel_id: int, user_id: int):
+        await asyncio.to_thread(self.claim_ticket, channel_id, user_id)
+
+    async def delete_ticket_async(self, channel_id: int):
+        await asyncio.to_thread(self.delete_ticket, channel_id)
+
+    async def get_ticket_by_channel_async(self, channel_id: int) -> Optional[Dict]:
+        # Cached rows need no thread hop
+        ticket = self._by_channel.get(channel_id)
+        if ticket is not None:
+            return ticket
+        return await asyncio.to_thread(self.get_ticket_by_channel, channel_id)
+
+    async def get_open_tickets_count_async(self, user_id: int, guild_id: int) -> int:
+        return await asyncio.to_thread(self.get_open_tickets_count, user_id, guild_id)
 
 class TicketsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db = TicketsDatabase()
         self.config_name = "tickets"
         self.config_path = os.path.join("config", f"{self.config_name}.json")
         self.default_config = {
@@ -173,9 +336,39 @@ class TicketsCog(commands.Cog):
                 "claimed": "#0000FF"
             },
             "support_role_id": 0,
-            "log_channel_id": 0
+            "log_channel_id": 0,
+            "db_pool_size": 4
         }
         self.config = self._load_and_validate_config()
+        # Parsed once here (never saved back to the file), read by the ticket helpers
+        self.config["_colors"] = self._parse_colors(self.config)
+        categories = self.config.get("categories", [])
+        self.config["_categories"] = {cat["name"]: cat for cat in categories}
+        for cat in categories:
+            # %-templates for the welcome embed title and the channel name ('%' in the names escaped)
+            title = f"{cat.get('emoji', '')} {cat.get('name', 'Ticket')}".replace("%", "%%")
+            cat["_title_template"] = f"{title} #%04d"
+            cat["_channel_template"] = cat.get("prefix", "ticket").replace("%", "%%") + "-%04d"
+        # Support roles and ticket categories, resolved once per guild
+        self._objects = GuildObjectCache()
+        # Ticket deletions waiting for their countdown, by channel_id
+        self._pending_deletes: Dict[int, asyncio.Task] = {}
+        self._select_options = build_category_options(categories)
+        self._colors = self.config["_colors"]
+        self._panel_embed_cfg = self.config.get("panel_message", {})
+
+        # Component custom_id -> handler, for on_interaction
+        self._ticket_actions = {"close": close_ticket, "delete": partial(delete_ticket, pending=self._pending_deletes)}
+        self._handlers = {
+            "ticket_category_select": self._on_category_select,
+            "ticket_claim": self._on_claim,
+        }
+        for action in self._ticket_actions:
+            self._handlers[f"ticket_{action}"] = partial(self._on_confirm_prompt, action)
+            self._handlers[f"ticket_confirm_{action}"] = partial(self._on_confirm, action)
+            self._handlers[f"ticket_cancel_{action}"] = self._on_cancel
+            self._handlers[f"ticket_reason_{action}"] = partial(self._on_reason, action)
+        self.db = TicketsDatabase(pool_size=int(self.config.get("db_pool_size", 4)))
 
     def _load_and_validate_config(self):
         if not os.path.exists(self.config_path):
@@ -200,17 +393,64 @@ class TicketsCog(commands.Cog):
 
         return config
 
+    def _parse_colors(self, config: Dict) -> Dict[str, int]:
+        """Embed colors as ints, falling back to the defaults for missing or invalid values"""
+        hex_colors = {
+            **self.default_config["embed_colors"],
+            "panel": self.default_config["panel_message"]["color"],
+        }
+        configured = {**config.get("embed_colors", {}), "panel": config.get("panel_message", {}).get("color")}
+        
+        colors = {}
+        for name, default in hex_colors.items():
+            try:
+                colors[name] = int(str(configured.get(name) or default).lstrip("#"), 16)
+            except ValueError:
+                colors[name] = int(default.lstrip("#"), 16)
+        return colors
+
     async def cog_load(self):
         # Register persistent views
         # We need to reconstruct the view with categories from config
-        categories = self.config.get("categories", [])
-        self.bot.add_view(TicketPanelView(categories))
-        self.bot.add_view(TicketControlsView(claimed=False))
-        self.bot.add_view(TicketControlsView(claimed=True)) # Register both states if needed, though custom_id handles it
-        # Actually, for dynamic views like ConfirmationView, we might not need persistent registration if we send them with timeout=None
-        # But for the Panel and Controls (which sit in channels), we do.
-        self.bot.add_view(ConfirmationView(action="close"))
-        self.bot.add_view(ConfirmationView(action="delete"))
+        self.bot.add_view(TicketPanelView(self._select_options))
+        # Persistent views are matched by custom_id, so one Controls view covers both claim states.
+        # Confirmation buttons are dispatched by on_interaction and need no registration.
+        self.bot.add_view(controls_view(False))
+
+    async def cog_unload(self):
+        # Pending deletions must not touch the database once it is closed
+        pending = list(self._pending_deletes.values())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._pending_deletes.clear()
+
+        # close() may wait on a running write: not on the event loop
+        await asyncio.to_thread(self.db.close)
+        self._objects.clear()
+
+    # Keep the role/category cache in sync with the guild
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._objects.forget_role(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._objects.forget_role(role.guild.id, role.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if isinstance(after, discord.CategoryChannel):
+            self._objects.forget_category(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.CategoryChannel):
+            self._objects.forget_category(channel.guild.id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._objects.forget_guild(guild.id)
 
     # Listeners for persistent buttons and dropdowns
     @commands.Cog.listener()
@@ -222,78 +462,72 @@ class TicketsCog(commands.Cog):
         if not custom_id:
             return
 
-        # Dropdown
-        if custom_id == "ticket_category_select":
-            # Get selected value
-            values = interaction.data.get("values", [])
-            if not values:
-                return
-            category_name = values[0]
-            await create_ticket(interaction, self.bot, self.db, self.config, category_name)
-            
-        # Buttons
-        elif custom_id == "ticket_claim":
-            await claim_ticket(interaction, self.bot, self.db, self.config)
-        elif custom_id == "ticket_close":
-            # Switch to confirmation view
-            view = ConfirmationView(action="close")
-            await interaction.response.edit_message(view=view)
-        elif custom_id == "ticket_delete":
-            # Switch to confirmation view
-            view = ConfirmationView(action="delete")
-            await interaction.response.edit_message(view=view)
-            
-        # Confirmation Actions
-        elif custom_id == "ticket_confirm_close":
-            await close_ticket(interaction, self.bot, self.db, self.config, confirmed=True)
-        elif custom_id == "ticket_confirm_delete":
-            await delete_ticket(interaction, self.bot, self.db, self.config, confirmed=True)
-            
-        # Cancel Actions (Return to controls)
-        elif custom_id == "ticket_cancel_close" or custom_id == "ticket_cancel_delete":
-            # We need to know if it was claimed to show the right button state
-            ticket = self.db.get_ticket_by_channel(interaction.channel_id)
-            claimed = ticket['claimed_by'] is not None if ticket else False
-            view = TicketControlsView(claimed=claimed)
-            await interaction.response.edit_message(view=view)
-            
-        # Reason Actions (Open Modal)
-        elif custom_id == "ticket_reason_close":
-            async def close_callback(inter, reason):
-                await close_ticket(inter, self.bot, self.db, self.config, confirmed=True, reason=reason)
-            await interaction.response.send_modal(ReasonModal(action="Close", callback_func=close_callback))
-            
-        elif custom_id == "ticket_reason_delete":
-            async def delete_callback(inter, reason):
-                await delete_ticket(inter, self.bot, self.db, self.config, confirmed=True, reason=reason)
-            await interaction.response.send_modal(ReasonModal(action="Delete", callback_func=delete_callback))
+        handler = self._handlers.get(custom_id)
+        if handler:
+            await handler(interaction)
+
+    # Dropdown
+    async def _on_category_select(self, interaction: discord.Interaction):
+        # Get selected value
+        values = interaction.data.get("values", [])
+        if not values:
+            return
+        category_name = values[0]
+        await create_ticket(interaction, self.bot, self.db, self.config, self._objects, category_name)
+
+    # Buttons
+    async def _on_claim(self, interaction: discord.Interaction):
+        await claim_ticket(interaction, self.bot, self.db, self.config)
+
+    async def _on_confirm_prompt(self, action: str, interaction: discord.Interaction):
+        # Switch to confirmation view
+        view = confirmation_view(action)
+        await interaction.response.edit_message(view=view)
+
+    # Confirmation Actions
+    async def _on_confirm(self, action: str, interaction: discord.Interaction):
+        await self._ticket_actions[action](interaction, self.bot, self.db, self.config, confirmed=True)
+
+    # Cancel Actions (Return to controls)
+    async def _on_cancel(self, interaction: discord.Interaction):
+        # We need to know if it was claimed to show the right button state
+        ticket = await self.db.get_ticket_by_channel_async(interaction.channel_id)
+        claimed = ticket['claimed_by'] is not None if ticket else False
+        view = controls_view(claimed)
+        await interaction.response.edit_message(view=view)
+
+    # Reason Actions (Open Modal)
+    async def _on_reason(self, action: str, interaction: discord.Interaction):
+        ticket_action = self._ticket_actions[action]
+        async def reason_callback(inter, reason):
+            await ticket_action(inter, self.bot, self.db, self.config, confirmed=True, reason=reason)
+        await interaction.response.send_modal(ReasonModal(action=action.capitalize(), callback_func=reason_callback))
 
     # Command Group
     ticket_group = app_commands.Group(name="ticket", description="Manage support tickets")
 
     @ticket_group.command(name="create", description="Create a new support ticket")
     async def create(self, interaction: discord.Interaction):
-        await create_ticket(interaction, self.bot, self.db, self.config)
+        await create_ticket(interaction, self.bot, self.db, self.config, self._objects)
 
     @ticket_group.command(name="panel", description="Send the ticket panel")
     @app_commands.checks.has_permissions(administrator=True)
     async def panel(self, interaction: discord.Interaction):
-        embed_config = self.config.get("panel_message", {})
+        embed_config = self._panel_embed_cfg
         embed = discord.Embed(
             title=embed_config.get("title", "Support Tickets"),
             description=embed_config.get("description", "Select a category below to open a ticket."),
-            color=int(embed_config.get("color", "#5865F2").replace("#", ""), 16)
+            color=self._colors["panel"]
         )
         
-        categories = self.config.get("categories", [])
-        view = TicketPanelView(categories)
+        view = TicketPanelView(self._select_options)
         await interaction.channel.send(embed=embed, view=view)
         await interaction.response.send_message("✅ Panel sent!", ephemeral=True)
 
     @ticket_group.command(name="close", description="Close the current ticket")
     async def close(self, interaction: discord.Interaction):
         # Trigger the same flow as the button
-        view = ConfirmationView(action="close")
+        view = confirmation_view("close")
         await interaction.response.send_message("Are you sure?", view=view, ephemeral=True)
 
     @ticket_group.command(name="claim", description="Claim the current ticket")
@@ -304,7 +538,7 @@ class TicketsCog(commands.Cog):
     @ticket_group.command(name="add", description="Add a user to the ticket")
     @app_commands.checks.has_permissions(manage_messages=True)
     async def add(self, interaction: discord.Interaction, user: discord.Member):
-        ticket = self.db.get_ticket_by_channel(interaction.channel_id)
+        ticket = await self.db.get_ticket_by_channel_async(interaction.channel_id)
         if not ticket:
             await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
             return
@@ -312,10 +546,18 @@ class TicketsCog(commands.Cog):
         await interaction.channel.set_permissions(user, read_messages=True, send_messages=True)
         await interaction.response.send_message(f"✅ Added {user.mention} to the ticket.")
 
+    @ticket_group.command(name="add_many", description="Add several users to the ticket at once")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    async def add_many(self, interaction: discord.Interaction, user1: discord.Member,
+                       user2: Optional[discord.Member] = None, user3: Optional[discord.Member] = None,
+                       user4: Optional[discord.Member] = None, user5: Optional[discord.Member] = None):
+        users = [user for user in (user1, user2, user3, user4, user5) if user]
+        await add_ticket_members(interaction, self.bot, self.db, self.config, users)
+
     @ticket_group.command(name="remove", description="Remove a user from the ticket")
     @app_commands.checks.has_permissions(manage_messages=True)
     async def remove(self, interaction: discord.Interaction, user: discord.Member):
-        ticket = self.db.get_ticket_by_channel(interaction.channel_id)
+        ticket = await self.db.get_ticket_by_channel_async(interaction.channel_id)
         if not ticket:
             await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
             return
@@ -326,7 +568,7 @@ class TicketsCog(commands.Cog):
     @ticket_group.command(name="move", description="Move the ticket to another category")
     @app_commands.checks.has_permissions(manage_channels=True)
     async def move(self, interaction: discord.Interaction, category: discord.CategoryChannel):
-        await move_ticket(interaction, self.bot, self.db, self.config, category.id)
+        await move_ticket(interaction, self.bot, self.db, self.config, self._objects, category.id)
 
 async def setup(bot):
     await bot.add_cog(TicketsCog(bot))
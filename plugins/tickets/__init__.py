@@ -1,5 +0,0 @@
-from .create import create_ticket, TicketControlsView
-from .close import close_ticket
-from .delete import delete_ticket
-from .claim import claim_ticket
-from .move import move_ticket